@@ -8,10 +8,18 @@ import hashlib
 import json
 import logging
 import os
+import re
 from pathlib import Path
 from typing import Dict, Any, Optional
 import time
 
+# Activation keys are UUIDs in canonical 8-4-4-4-12 form
+_UUID_KEY_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+def is_valid_key_format(user_key: str) -> bool:
+    """Check whether a (stripped) activation key is in UUID 8-4-4-4-12 form"""
+    return bool(_UUID_KEY_RE.match(user_key))
+
 class EntitlementValidator:
     """Validates and manages SAM Pro feature entitlements"""
     
@@ -199,9 +207,7 @@ class EntitlementValidator:
                 }
 
             # Check UUID format pattern (8-4-4-4-12)
-            import re
-            uuid_pattern = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-            if not re.match(uuid_pattern, user_key):
+            if not is_valid_key_format(user_key):
                 self._record_attempt(state, False)
                 self._save_state(state)
                 return {
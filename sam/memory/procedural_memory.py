@@ -17,11 +17,12 @@ Version: 2.0.0 (Enhanced Implementation)
 
 import json
 import logging
+import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +67,16 @@ class Procedure(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+    
+    @validator('tags')
+    def intern_tags(cls, v):
+        """Intern tag strings so tags repeated across procedures share one object."""
+        return [sys.intern(tag) for tag in v]
+    
+    @validator('category')
+    def intern_category(cls, v):
+        """Intern the category; the store holds only a handful of distinct values."""
+        return sys.intern(v) if v is not None else v
 
 class ProceduralMemoryStore:
     """Secure storage and management system for procedures."""
@@ -199,6 +210,30 @@ class ProceduralMemoryStore:
             logger.error(f"Failed to add procedure: {e}")
             return False
     
+    def add_procedures(self, procedures: List[Procedure]) -> List[bool]:
+        """Add several procedures with a single save, instead of one save per procedure."""
+        procedures = list(procedures)
+        if not procedures:
+            return []
+        
+        try:
+            now = datetime.now()
+            for procedure in procedures:
+                procedure.created_date = now
+                procedure.last_modified = now
+                self.procedures[procedure.id] = procedure
+            
+            success = self.save_procedures()
+            
+            if success:
+                logger.info(f"Added {len(procedures)} procedures")
+            
+            return [success] * len(procedures)
+            
+        except Exception as e:
+            logger.error(f"Failed to add procedures: {e}")
+            return [False] * len(procedures)
+    
     def get_procedure(self, procedure_id: str) -> Optional[Procedure]:
         """Retrieve a procedure by its unique ID."""
         return self.procedures.get(procedure_id)
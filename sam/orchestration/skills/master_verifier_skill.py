@@ -19,6 +19,8 @@ import time
 import yaml
 import logging
 import functools
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
@@ -27,6 +29,14 @@ from .base import BaseSkillModule, SkillExecutionError, SkillDependencyError
 
 logger = logging.getLogger(__name__)
 
+# Identity-keyed cache key memo only holds small inputs, least recently used evicted
+_STR_ID_CACHE_MAX_CHARS = 4096
+_STR_ID_CACHE_MAX_ENTRIES = 1024
+
+# Loaded models shared across skill instances, keyed by (model name, device)
+_MODEL_REGISTRY: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+_MODEL_REGISTRY_LOCK = threading.Lock()
+
 
 class MasterVerifierSkill(BaseSkillModule):
     """
@@ -71,6 +81,7 @@ class MasterVerifierSkill(BaseSkillModule):
         self._verification_cache = {}
         self._cache_hits = 0
         self._cache_misses = 0
+        self._str_id_cache: "OrderedDict[Tuple[int, int, int], Tuple[str, str, str, str]]" = OrderedDict()
         
         # Statistics tracking
         self._verification_count = 0
@@ -132,39 +143,60 @@ class MasterVerifierSkill(BaseSkillModule):
     def _load_model(self) -> Tuple[Any, Any]:
         """Load the Master-RM model and tokenizer with caching."""
         try:
+            # Configure the CUDA caching allocator before torch touches the GPU
+            os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True,max_split_size_mb:128")
+            
             # Import transformers here to avoid dependency issues if not installed
             from transformers import AutoTokenizer, AutoModelForSequenceClassification
             import torch
             
             model_name = self.config['model']['name']
             cache_dir = self.config['model']['cache_dir']
-            device = self.config['model']['device']
-            
-            logger.info(f"Loading Master-RM model: {model_name}")
+            device = str(self.config['model']['device'])
             
-            # Create cache directory
-            Path(cache_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Load tokenizer and model
-            tokenizer = AutoTokenizer.from_pretrained(
-                model_name,
-                cache_dir=cache_dir,
-                trust_remote_code=self.config['model'].get('trust_remote_code', False)
-            )
-            
-            model = AutoModelForSequenceClassification.from_pretrained(
-                model_name,
-                cache_dir=cache_dir,
-                trust_remote_code=self.config['model'].get('trust_remote_code', False),
-                torch_dtype=torch.float16 if device != 'cpu' else torch.float32
-            )
-            
-            # Move to appropriate device
+            # Resolve to an explicit device (e.g. "cuda:0") so every instance
+            # shares one copy of the weights instead of following the current device
             if device == 'auto':
                 device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            if device == 'cuda':
+                device = f"cuda:{torch.cuda.current_device()}"
             
-            model = model.to(device)
-            model.eval()
+            registry_key = (model_name, device)
+            with _MODEL_REGISTRY_LOCK:
+                if registry_key in _MODEL_REGISTRY:
+                    logger.info(f"Reusing loaded Master-RM model on {device}")
+                    return _MODEL_REGISTRY[registry_key]
+                
+                logger.info(f"Loading Master-RM model: {model_name}")
+                
+                if device.startswith('cuda'):
+                    torch.cuda.set_device(device)
+                
+                # Create cache directory
+                Path(cache_dir).mkdir(parents=True, exist_ok=True)
+                
+                # Load tokenizer and model
+                tokenizer = AutoTokenizer.from_pretrained(
+                    model_name,
+                    cache_dir=cache_dir,
+                    trust_remote_code=self.config['model'].get('trust_remote_code', False)
+                )
+                
+                model = AutoModelForSequenceClassification.from_pretrained(
+                    model_name,
+                    cache_dir=cache_dir,
+                    trust_remote_code=self.config['model'].get('trust_remote_code', False),
+                    torch_dtype=torch.float16 if device != 'cpu' else torch.float32
+                )
+                
+                model = model.to(device)
+                model.eval()
+                
+                # Release loader staging memory back to the allocator
+                if device.startswith('cuda'):
+                    torch.cuda.empty_cache()
+                
+                _MODEL_REGISTRY[registry_key] = (model, tokenizer)
             
             logger.info(f"Master-RM model loaded successfully on {device}")
             return model, tokenizer
@@ -192,23 +224,28 @@ class MasterVerifierSkill(BaseSkillModule):
             # Extract inputs
             question = uif.intermediate_data.get('verification_question', '')
             response = uif.intermediate_data.get('verification_response', '')
-            reference = uif.intermediate_data.get('verification_reference', '')
-            context = uif.intermediate_data.get('verification_context', {})
             
             # Validate inputs
             if not question or not response:
                 raise SkillDependencyError("verification_question and verification_response are required")
             
-            # Check cache first
-            cache_key = self._generate_cache_key(question, response, reference)
-            if self.config['verification'].get('enable_caching', True) and cache_key in self._verification_cache:
-                cached_result = self._verification_cache[cache_key]
-                self._cache_hits += 1
-                
-                # Update UIF with cached results
-                uif.intermediate_data.update(cached_result)
-                uif.add_log_entry(f"Used cached verification result", self.skill_name)
-                return uif
+            reference = uif.intermediate_data.get('verification_reference', '')
+            
+            # Check cache first, before any context extraction or model work
+            enable_caching = self.config['verification'].get('enable_caching', True)
+            cache_key = None
+            if enable_caching:
+                cache_key = self._lookup_cache_key(question, response, reference)
+                cached_result = self._verification_cache.get(cache_key)
+                if cached_result is not None:
+                    self._cache_hits += 1
+                    
+                    # Update UIF with cached results
+                    uif.intermediate_data.update(cached_result)
+                    uif.add_log_entry(f"Used cached verification result", self.skill_name)
+                    return uif
+            
+            context = uif.intermediate_data.get('verification_context', {})
             
             self._cache_misses += 1
             
@@ -216,7 +253,7 @@ class MasterVerifierSkill(BaseSkillModule):
             verification_result = self._verify_response(question, response, reference, context)
             
             # Cache the result
-            if self.config['verification'].get('enable_caching', True):
+            if enable_caching:
                 self._verification_cache[cache_key] = verification_result
             
             # Update statistics
@@ -309,15 +346,17 @@ class MasterVerifierSkill(BaseSkillModule):
                 reference=reference
             )
 
-            # Tokenize input
+            # Tokenize input (single sequence, so there is nothing to pad)
             max_length = self.config['model'].get('max_length', 2048)
             inputs = self._tokenizer(
                 formatted_prompt,
                 return_tensors="pt",
                 max_length=max_length,
                 truncation=True,
-                padding=True
+                padding=False
             )
+            if 'attention_mask' not in inputs:
+                inputs['attention_mask'] = torch.ones_like(inputs['input_ids'])
 
             # Move to same device as model
             device = next(self._model.parameters()).device
@@ -329,11 +368,16 @@ class MasterVerifierSkill(BaseSkillModule):
                 logits = outputs.logits
 
                 # Get prediction (assuming binary classification: 0=superficial, 1=substantive)
+                # max() yields both the argmax and the top probability; stack them
+                # so a single device-to-host copy transfers prediction and confidence
                 probabilities = torch.softmax(logits, dim=-1)
-                prediction = torch.argmax(probabilities, dim=-1).item()
-                confidence = torch.max(probabilities, dim=-1).values.item()
+                top = probabilities.max(dim=-1)
+                top_pair = torch.stack(
+                    [top.indices.to(torch.float32), top.values.to(torch.float32)], dim=-1
+                ).cpu()
+                prediction, confidence = top_pair[0].tolist()
 
-            is_substantive = bool(prediction)
+            is_substantive = bool(int(prediction))
 
             # Apply confidence threshold
             confidence_threshold = self.config['verification'].get('confidence_threshold', 0.8)
@@ -469,6 +513,28 @@ class MasterVerifierSkill(BaseSkillModule):
                 'verification_method': 'length_heuristic'
             }
 
+    def _lookup_cache_key(self, question: str, response: str, reference: str) -> str:
+        """
+        Return the cache key for the inputs, reusing the digest when the exact
+        same string objects are passed again (e.g. orchestrator hot loops).
+
+        Entries keep references to the strings so their ids cannot be reused
+        while the entry exists; the identity check guards against stale ids.
+        """
+        id_key = (id(question), id(response), id(reference))
+        entry = self._str_id_cache.get(id_key)
+        if entry is not None and entry[0] is question and entry[1] is response and entry[2] is reference:
+            self._str_id_cache.move_to_end(id_key)
+            return entry[3]
+
+        cache_key = self._generate_cache_key(question, response, reference)
+        if len(question) + len(response) + len(reference) <= _STR_ID_CACHE_MAX_CHARS:
+            self._str_id_cache[id_key] = (question, response, reference, cache_key)
+            self._str_id_cache.move_to_end(id_key)
+            if len(self._str_id_cache) > _STR_ID_CACHE_MAX_ENTRIES:
+                self._str_id_cache.popitem(last=False)
+        return cache_key
+
     def _generate_cache_key(self, question: str, response: str, reference: str) -> str:
         """Generate a cache key for the verification request."""
         import hashlib
@@ -9,14 +9,72 @@ Author: SAM Development Team
 Version: 1.0.0
 """
 
+import hashlib
 import json
 import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 import streamlit as st
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
+# Profile reasoning config keys that may be updated at runtime
+_ALLOWED_CFG_KEYS = frozenset({
+    "default_reasoning_style", "default_strength", "auto_adapt", "description", "fallback_style"
+})
+
+# Profile-specific reasoning defaults for profiles without a reasoning_style_config
+_PROFILE_DEFAULTS = MappingProxyType({
+    "researcher": MappingProxyType({
+        "default_reasoning_style": "researcher_style",
+        "default_strength": 1.2,
+        "description": "Research-focused analytical reasoning"
+    }),
+    "business": MappingProxyType({
+        "default_reasoning_style": "step_by_step_reasoning",
+        "default_strength": 1.0,
+        "description": "Systematic business analysis"
+    }),
+    "legal": MappingProxyType({
+        "default_reasoning_style": "researcher_style",
+        "default_strength": 1.3,
+        "description": "Rigorous legal analysis"
+    }),
+    "general": MappingProxyType({
+        "default_reasoning_style": "step_by_step_reasoning",
+        "default_strength": 1.0,
+        "description": "Balanced general reasoning"
+    })
+})
+
+# Resolve Streamlit session state support once; the proxy resolves per session on access
+_HAS_SESSION_STATE = hasattr(st, 'session_state')
+_SESSION_STATE = st.session_state if _HAS_SESSION_STATE else None
+
+# Fragments (Streamlit 1.37+) let the profile controls rerun without a full page rerun
+_HAS_FRAGMENT = hasattr(st, 'fragment')
+_fragment = st.fragment if _HAS_FRAGMENT else (lambda func: func)
+
+# Parsed profile configs are cached as JSON in the user's SAM cache directory
+# (never in the source tree), keyed by profiles directory and file signature
+_PROFILE_CACHE_DIR = Path.home() / ".sam" / "cache"
+_PROFILE_CACHE_VERSION = 3
+
 class ProfileReasoningIntegration:
     """Manages integration between user profiles and reasoning styles."""
     
@@ -30,6 +88,7 @@ class ProfileReasoningIntegration:
         self.profiles_dir = Path(profiles_dir)
         self.profile_configs = {}
         self.current_profile = None
+        self.profiles_signature = None
         self._load_profile_configs()
         
     def _load_profile_configs(self):
@@ -38,60 +97,124 @@ class ProfileReasoningIntegration:
             logger.warning(f"Profiles directory not found: {self.profiles_dir}")
             return
         
-        profile_files = list(self.profiles_dir.glob("*.json"))
+        with os.scandir(self.profiles_dir) as entries:
+            profile_files = sorted(
+                (e for e in entries if e.name.endswith('.json') and e.is_file()),
+                key=lambda e: e.name
+            )
         
-        for profile_file in profile_files:
-            try:
-                with open(profile_file, 'r') as f:
-                    profile_data = json.load(f)
-                
-                profile_name = profile_data.get("name", profile_file.stem)
-                
-                # Extract reasoning style configuration
-                reasoning_config = profile_data.get("reasoning_style_config", {})
-                
-                if reasoning_config:
-                    self.profile_configs[profile_name] = reasoning_config
-                    logger.info(f"Loaded reasoning config for profile: {profile_name}")
-                else:
-                    # Create default config for profiles without reasoning style config
-                    default_config = self._create_default_reasoning_config(profile_name)
-                    self.profile_configs[profile_name] = default_config
-                    logger.info(f"Created default reasoning config for profile: {profile_name}")
-                    
-            except Exception as e:
-                logger.error(f"Failed to load profile {profile_file}: {e}")
+        # Reuse the cached configs when no profile file has changed
+        signature = self._profile_signature(profile_files)
+        self.profiles_signature = signature
+        cached_configs = self._read_profile_cache(signature)
+        if cached_configs is not None:
+            self.profile_configs.update(cached_configs)
+            logger.info("Loaded cached reasoning configurations for %s profiles", len(self.profile_configs))
+            return
+        
+        # Read and parse files concurrently; file reads and orjson parsing release the GIL
+        if len(profile_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(profile_files))) as executor:
+                parsed_profiles = list(executor.map(self._read_profile_file, profile_files))
+        else:
+            parsed_profiles = [self._read_profile_file(p) for p in profile_files]
+        
+        for profile_file, profile_data in zip(profile_files, parsed_profiles):
+            if profile_data is None:
+                continue
+            
+            # Fall back to the file stem when "name" is missing or not a string
+            profile_name = profile_data.get("name")
+            if not isinstance(profile_name, str):
+                profile_name = profile_file.name.rsplit('.', 1)[0]
+            profile_name = sys.intern(profile_name)
+            
+            # Extract reasoning style configuration
+            reasoning_config = profile_data.get("reasoning_style_config", {})
+            
+            if reasoning_config:
+                self.profile_configs[profile_name] = reasoning_config
+                logger.info("Loaded reasoning config for profile: %s", profile_name)
+            else:
+                # Create default config for profiles without reasoning style config
+                default_config = self._create_default_reasoning_config(profile_name)
+                self.profile_configs[profile_name] = default_config
+                logger.info("Created default reasoning config for profile: %s", profile_name)
+        
+        self._write_profile_cache(signature)
+        logger.info("Loaded reasoning configurations for %s profiles", len(self.profile_configs))
+    
+    def _read_profile_file(self, profile_file: os.DirEntry) -> Optional[Dict[str, Any]]:
+        """Read and parse a single profile file, returning None if it is unusable."""
+        try:
+            with open(profile_file.path, 'rb') as f:
+                profile_data = _json_loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load profile {profile_file.path}: {e}")
+            return None
+        
+        if not isinstance(profile_data, dict):
+            logger.error(f"Failed to load profile {profile_file.path}: expected a JSON object")
+            return None
+        return profile_data
+    
+    def _profile_signature(self, profile_files: List[os.DirEntry]) -> Optional[List]:
+        """Build a cache signature from each profile file's name, modification time and size."""
+        if not profile_files:
+            return None
+        try:
+            # Lists rather than tuples so the signature round-trips through JSON unchanged
+            files = [[p.name, p.stat().st_mtime_ns, p.stat().st_size] for p in profile_files]
+        except OSError:
+            return None
+        return [_PROFILE_CACHE_VERSION, files]
+
+    def _profile_cache_file(self) -> Path:
+        """Cache file for this profiles directory inside the user cache directory."""
+        dir_key = hashlib.sha256(str(self.profiles_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+        return _PROFILE_CACHE_DIR / f"reasoning_profiles_{dir_key}.json"
+    
+    def _read_profile_cache(self, signature: Optional[List]) -> Optional[Dict[str, Any]]:
+        """Return cached profile configs if the cache matches the signature."""
+        if signature is None:
+            return None
+        try:
+            with open(self._profile_cache_file(), 'rb') as f:
+                cached = _json_loads(f.read())
+            cached_signature = cached["signature"]
+            cached_configs = cached["configs"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug("Ignoring unreadable profile cache: %s", e)
+            return None
         
-        logger.info(f"Loaded reasoning configurations for {len(self.profile_configs)} profiles")
+        if cached_signature != signature or not isinstance(cached_configs, dict):
+            return None
+        return {sys.intern(name): config for name, config in cached_configs.items()}
+    
+    def _write_profile_cache(self, signature: Optional[List]):
+        """Atomically persist the loaded profile configs with their signature."""
+        if signature is None:
+            return
+        cache_file = self._profile_cache_file()
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                f.write(_json_dumps({"signature": signature, "configs": self.profile_configs}))
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError) as e:
+            logger.debug("Could not write profile cache: %s", e)
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def _create_default_reasoning_config(self, profile_name: str) -> Dict[str, Any]:
         """Create default reasoning configuration for a profile."""
-        # Profile-specific defaults
-        profile_defaults = {
-            "researcher": {
-                "default_reasoning_style": "researcher_style",
-                "default_strength": 1.2,
-                "description": "Research-focused analytical reasoning"
-            },
-            "business": {
-                "default_reasoning_style": "step_by_step_reasoning",
-                "default_strength": 1.0,
-                "description": "Systematic business analysis"
-            },
-            "legal": {
-                "default_reasoning_style": "researcher_style",
-                "default_strength": 1.3,
-                "description": "Rigorous legal analysis"
-            },
-            "general": {
-                "default_reasoning_style": "step_by_step_reasoning",
-                "default_strength": 1.0,
-                "description": "Balanced general reasoning"
-            }
-        }
-        
         # Get profile-specific default or use general default
-        default = profile_defaults.get(profile_name, profile_defaults["general"])
+        default = _PROFILE_DEFAULTS.get(profile_name, _PROFILE_DEFAULTS["general"])
         
         return {
             "default_reasoning_style": default["default_reasoning_style"],
@@ -115,30 +238,31 @@ class ProfileReasoningIntegration:
         Returns:
             Tuple of (reasoning_style, strength)
         """
-        config = self.get_profile_reasoning_config(profile_name)
+        config = self.profile_configs.get(profile_name)
         
         if not config:
             logger.warning(f"No reasoning config found for profile: {profile_name}")
             return "step_by_step_reasoning", 1.0
         
-        style = config.get("default_reasoning_style", "step_by_step_reasoning")
-        strength = config.get("default_strength", 1.0)
+        c_get = config.get
+        style = c_get("default_reasoning_style", "step_by_step_reasoning")
+        strength = c_get("default_strength", 1.0)
         
         # Update session state if using Streamlit
-        try:
-            if hasattr(st, 'session_state'):
+        if _HAS_SESSION_STATE:
+            try:
                 # Only update if auto_adapt is enabled and user hasn't manually overridden
-                auto_adapt = config.get("auto_adapt", True)
-                user_override = st.session_state.get("reasoning_style_user_override", False)
+                auto_adapt = c_get("auto_adapt", True)
+                user_override = _SESSION_STATE.get("reasoning_style_user_override", False)
                 
                 if auto_adapt and not user_override:
-                    st.session_state.reasoning_style = style
-                    st.session_state.reasoning_strength = strength
-                    st.session_state.reasoning_enabled = True
+                    _SESSION_STATE.update(
+                        reasoning_style=style, reasoning_strength=strength, reasoning_enabled=True
+                    )
                     
-                    logger.info(f"Applied profile reasoning style: {profile_name} -> {style} (strength: {strength})")
-        except Exception as e:
-            logger.warning(f"Could not update session state: {e}")
+                    logger.info("Applied profile reasoning style: %s -> %s (strength: %s)", profile_name, style, strength)
+            except Exception as e:
+                logger.warning(f"Could not update session state: {e}")
         
         return style, strength
     
@@ -146,11 +270,12 @@ class ProfileReasoningIntegration:
         """Set the current active profile and apply its reasoning style."""
         self.current_profile = profile_name
         
-        if profile_name in self.profile_configs:
-            style, strength = self.apply_profile_reasoning_style(profile_name)
-            logger.info(f"Switched to profile '{profile_name}' with reasoning style '{style}'")
-        else:
+        if self.profile_configs.get(profile_name) is None:
             logger.warning(f"Profile '{profile_name}' not found in configurations")
+            return
+        
+        style, strength = self.apply_profile_reasoning_style(profile_name)
+        logger.info("Switched to profile '%s' with reasoning style '%s'", profile_name, style)
     
     def get_available_profiles(self) -> list:
         """Get list of available profiles with reasoning configurations."""
@@ -165,16 +290,16 @@ class ProfileReasoningIntegration:
     
     def update_profile_reasoning_config(self, profile_name: str, **kwargs):
         """Update reasoning configuration for a profile."""
-        if profile_name not in self.profile_configs:
-            self.profile_configs[profile_name] = self._create_default_reasoning_config(profile_name)
-        
-        config = self.profile_configs[profile_name]
+        config = self.profile_configs.get(profile_name)
+        if config is None:
+            config = self._create_default_reasoning_config(profile_name)
+            self.profile_configs[profile_name] = config
         
         # Update configuration
         for key, value in kwargs.items():
-            if key in ["default_reasoning_style", "default_strength", "auto_adapt", "description", "fallback_style"]:
+            if key in _ALLOWED_CFG_KEYS:
                 config[key] = value
-                logger.info(f"Updated {key} for profile {profile_name}: {value}")
+                logger.info("Updated %s for profile %s: %s", key, profile_name, value)
         
         # Apply changes if this is the current profile
         if self.current_profile == profile_name:
@@ -182,25 +307,29 @@ class ProfileReasoningIntegration:
     
     def reset_to_profile_defaults(self, profile_name: str):
         """Reset reasoning style to profile defaults, clearing any user overrides."""
-        try:
-            if hasattr(st, 'session_state'):
-                st.session_state.reasoning_style_user_override = False
-                
-            self.apply_profile_reasoning_style(profile_name)
-            logger.info(f"Reset reasoning style to defaults for profile: {profile_name}")
-            
-        except Exception as e:
-            logger.warning(f"Could not reset to profile defaults: {e}")
+        if _HAS_SESSION_STATE:
+            try:
+                _SESSION_STATE.reasoning_style_user_override = False
+            except Exception as e:
+                logger.warning(f"Could not reset to profile defaults: {e}")
+                return
+        
+        self.apply_profile_reasoning_style(profile_name)
+        logger.info("Reset reasoning style to defaults for profile: %s", profile_name)
 
 # Global instance
 _profile_integration = None
+_profile_integration_lock = threading.Lock()
 
 def get_profile_reasoning_integration() -> ProfileReasoningIntegration:
     """Get or create a global profile reasoning integration instance."""
     global _profile_integration
     
+    # Double-checked so concurrent first calls construct exactly one instance
     if _profile_integration is None:
-        _profile_integration = ProfileReasoningIntegration()
+        with _profile_integration_lock:
+            if _profile_integration is None:
+                _profile_integration = ProfileReasoningIntegration()
     
     return _profile_integration
 
@@ -220,6 +349,19 @@ def get_profile_reasoning_config(profile_name: str) -> Optional[Dict[str, Any]]:
     return integration.get_profile_reasoning_config(profile_name)
 
 # Streamlit integration functions
+@st.cache_data(show_spinner=False)
+def _cached_available_profiles(profiles_signature: Optional[List], profile_count: int) -> list:
+    """Available profile names, recomputed only when the profile files or configs change."""
+    return get_profile_reasoning_integration().get_available_profiles()
+
+def _rerun_profile_controls():
+    """Rerun only the profile controls fragment when fragments are supported."""
+    if _HAS_FRAGMENT:
+        st.rerun(scope="fragment")
+    else:
+        st.rerun()
+
+@_fragment
 def render_profile_reasoning_controls():
     """Render profile-based reasoning controls in Streamlit."""
     try:
@@ -228,7 +370,9 @@ def render_profile_reasoning_controls():
         st.markdown("### 👤 Profile-Based Reasoning")
         
         # Profile selector
-        available_profiles = integration.get_available_profiles()
+        available_profiles = _cached_available_profiles(
+            integration.profiles_signature, len(integration.profile_configs)
+        )
         current_profile = st.session_state.get("current_profile", "general")
         
         selected_profile = st.selectbox(
@@ -242,7 +386,7 @@ def render_profile_reasoning_controls():
         if selected_profile != st.session_state.get("current_profile"):
             st.session_state.current_profile = selected_profile
             integration.set_current_profile(selected_profile)
-            st.rerun()
+            _rerun_profile_controls()
         
         # Show profile description
         description = integration.get_profile_description(selected_profile)
@@ -259,8 +403,21 @@ def render_profile_reasoning_controls():
                 if st.button("🔄 Reset to Profile Defaults"):
                     integration.reset_to_profile_defaults(selected_profile)
                     st.success(f"Reset reasoning style to {selected_profile} profile defaults")
-                    st.rerun()
+                    _rerun_profile_controls()
         
     except Exception as e:
         logger.error(f"Error rendering profile reasoning controls: {e}")
         st.error("Profile reasoning controls unavailable")
+
+def _warm_reasoning_singletons():
+    """Build the profile integration and prompt steerer singletons ahead of first use."""
+    try:
+        get_profile_reasoning_integration()
+        from sam.reasoning.prompt_steerer import get_prompt_steerer
+        get_prompt_steerer()
+    except Exception as e:
+        logger.debug("Reasoning singleton warmup failed: %s", e)
+
+# Opt-in background warmup so first page render does not pay for JSON parsing
+if os.getenv('SAM_EAGER_WARMUP', '0') == '1':
+    threading.Thread(target=_warm_reasoning_singletons, name="sam-reasoning-warmup", daemon=True).start()
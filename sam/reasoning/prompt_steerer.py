@@ -12,15 +12,55 @@ Author: SAM Development Team
 Version: 1.0.0
 """
 
+import functools
 import json
 import logging
 import os
-from typing import Dict, Optional, List, Any
-from dataclasses import dataclass
+import sys
+import threading
+from typing import Dict, Optional, List, Any, Sequence, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Fields a style template must define; the rest have defaults
+_REQUIRED_TEMPLATE_KEYS = ('style_name', 'description', 'system_instruction', 'reasoning_pattern')
+
+# Strength level names indexed by the bucket codes from _bucket_strengths
+_STRENGTH_LEVELS = ("low", "medium", "high")
+
+
+def _bucket_strengths_py(strengths: Sequence[float]) -> List[int]:
+    """Classify strengths into level codes (0=low, 1=medium, 2=high)."""
+    return [0 if s < 0.8 else (2 if s > 1.2 else 1) for s in strengths]
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _bucket_strengths(strengths):
+        """Classify a float64 array of strengths into int8 level codes."""
+        out = np.empty(strengths.shape[0], np.int8)
+        for i in range(strengths.shape[0]):
+            s = strengths[i]
+            out[i] = 0 if s < 0.8 else (2 if s > 1.2 else 1)
+        return out
+else:
+    _bucket_strengths = _bucket_strengths_py
+
 @dataclass
 class ReasoningStyle:
     """Configuration for a reasoning style."""
@@ -31,6 +71,46 @@ class ReasoningStyle:
     strength_modulation: Dict[str, float]
     example_phrases: List[str]
     cognitive_markers: List[str]
+    
+    # Derived steering fragments, computed once at construction
+    pattern_steps: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _examples_joined: str = field(init=False, repr=False, compare=False)
+    _markers_joined: str = field(init=False, repr=False, compare=False)
+    _description_lower: str = field(init=False, repr=False, compare=False)
+    
+    # Static text surrounding the user prompt for each steering strength
+    _subtle_prefix: str = field(init=False, repr=False, compare=False)
+    _standard_prefix: str = field(init=False, repr=False, compare=False)
+    _standard_suffix: str = field(init=False, repr=False, compare=False)
+    _strong_prefix: str = field(init=False, repr=False, compare=False)
+    _strong_suffix: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
+        self.pattern_steps = tuple(self.reasoning_pattern.split(' → '))
+        self._examples_joined = ', '.join(self.example_phrases[:3])
+        self._markers_joined = ', '.join(self.cognitive_markers[:3])
+        self._description_lower = self.description.lower()
+        
+        # Include example phrases if available
+        examples_text = ""
+        if self.example_phrases:
+            examples_text = f"\n\nExample phrases to guide your response: {self._examples_joined}"
+        
+        self._subtle_prefix = f"Consider approaching this with {self.pattern_steps[0]}.\n\n"
+        self._standard_prefix = f"System: {self.system_instruction}\n\nUser Query: "
+        self._standard_suffix = f"\n\nPlease respond following the {self._description_lower} approach."
+        self._strong_prefix = ''.join((
+            "System: ", self.system_instruction,
+            "\n\nReasoning Pattern: ", self.reasoning_pattern,
+            "\n\nCognitive Focus: Emphasize ", self._markers_joined, " in your response.",
+            examples_text,
+            "\n\nUser Query: ",
+        ))
+        self._strong_suffix = (
+            f"\n\nPlease provide a comprehensive response that fully embodies the {self._description_lower} "
+            "approach, demonstrating clear adherence to the specified reasoning pattern."
+        )
 
 class PromptSteerer:
     """
@@ -52,47 +132,85 @@ class PromptSteerer:
         
         self.assets_dir = Path(assets_dir)
         self.reasoning_styles: Dict[str, ReasoningStyle] = {}
+        self._template_paths: List[str] = []
+        self._styles_loaded = False
+        self._styles_lock = threading.Lock()
         self.default_style = "step_by_step_reasoning"
         
-        # Load reasoning styles from templates
+        # Memoize rendered prompts per (prompt, style, strength level)
+        self._build_enhanced_prompt = functools.lru_cache(maxsize=256)(self._render_enhanced_prompt)
+        
+        # Discover reasoning style templates (parsed together on first use)
         self._load_reasoning_styles()
         
-        logger.info(f"PromptSteerer initialized with {len(self.reasoning_styles)} styles")
+        logger.info("PromptSteerer initialized with %s style templates", len(self._template_paths))
     
     def _load_reasoning_styles(self):
-        """Load reasoning styles from template files."""
+        """Index reasoning style template files without parsing them."""
         if not self.assets_dir.exists():
             logger.warning(f"Assets directory not found: {self.assets_dir}")
             self._create_default_styles()
+            self._styles_loaded = True
             return
         
-        # Load from template files
-        template_files = list(self.assets_dir.glob("*_template.json"))
+        with os.scandir(self.assets_dir) as entries:
+            self._template_paths = sorted(
+                e.path for e in entries if e.name.endswith("_template.json") and e.is_file()
+            )
+    
+    def _ensure_styles_loaded(self):
+        """Parse every indexed template once, keyed by its style_name."""
+        if self._styles_loaded:
+            return
         
-        for template_file in template_files:
-            try:
-                with open(template_file, 'r') as f:
-                    template_data = json.load(f)
-                
-                style = ReasoningStyle(
-                    name=template_data["style_name"],
-                    description=template_data["description"],
-                    system_instruction=template_data["system_instruction"],
-                    reasoning_pattern=template_data["reasoning_pattern"],
-                    strength_modulation=template_data.get("strength_modulation", {"low": 0.5, "medium": 1.0, "high": 1.5}),
-                    example_phrases=template_data.get("example_phrases", []),
-                    cognitive_markers=template_data.get("cognitive_markers", [])
-                )
-                
-                self.reasoning_styles[style.name] = style
-                logger.info(f"Loaded reasoning style: {style.name}")
-                
-            except Exception as e:
-                logger.error(f"Failed to load template {template_file}: {e}")
+        # The steerer is a shared singleton, so only one thread parses
+        with self._styles_lock:
+            if self._styles_loaded:
+                return
+            
+            for template_file in self._template_paths:
+                style = self._parse_template(template_file)
+                if style is not None:
+                    self.reasoning_styles[style.name] = style
+                    logger.info("Loaded reasoning style: %s", style.name)
+            
+            # Create default styles if no template could be loaded
+            if not self.reasoning_styles:
+                self._create_default_styles()
+            
+            self._styles_loaded = True
+    
+    def _parse_template(self, template_file: str) -> Optional[ReasoningStyle]:
+        """Build a reasoning style from a template file, or None if it is invalid."""
+        try:
+            with open(template_file, 'rb') as f:
+                template_data = _json_loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load template {template_file}: {e}")
+            return None
         
-        # Create default styles if none were loaded
-        if not self.reasoning_styles:
-            self._create_default_styles()
+        if not (
+            isinstance(template_data, dict)
+            and all(k in template_data for k in _REQUIRED_TEMPLATE_KEYS)
+            and isinstance(template_data["style_name"], str)
+        ):
+            logger.error(f"Failed to load template {template_file}: missing required fields")
+            return None
+        
+        return ReasoningStyle(
+            name=template_data["style_name"],
+            description=template_data["description"],
+            system_instruction=template_data["system_instruction"],
+            reasoning_pattern=template_data["reasoning_pattern"],
+            strength_modulation=template_data.get("strength_modulation", {"low": 0.5, "medium": 1.0, "high": 1.5}),
+            example_phrases=template_data.get("example_phrases", []),
+            cognitive_markers=template_data.get("cognitive_markers", [])
+        )
+    
+    def _get_style(self, style_name: str) -> Optional[ReasoningStyle]:
+        """Get a reasoning style, loading the templates on first access."""
+        self._ensure_styles_loaded()
+        return self.reasoning_styles.get(style_name)
     
     def _create_default_styles(self):
         """Create default reasoning styles if templates are not available."""
@@ -158,28 +276,64 @@ class PromptSteerer:
         Returns:
             Enhanced prompt with style-specific steering
         """
-        if style_name == "default" or style_name not in self.reasoning_styles:
+        if style_name == "default":
             return base_prompt
         
-        style = self.reasoning_styles[style_name]
+        style = self._get_style(style_name)
+        if style is None:
+            return base_prompt
         
         # Determine strength level
         strength_level = self._determine_strength_level(strength)
+        enhanced_prompt = self._build_enhanced_prompt(base_prompt, style_name, strength_level)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Applied %s steering with strength %s to prompt", style_name, strength)
+        return enhanced_prompt
+    
+    def apply_style_batch(self, prompts: List[str], style_name: str, strengths: Sequence[float]) -> List[str]:
+        """
+        Apply a reasoning style to many prompts, each with its own strength.
+        
+        Args:
+            prompts: The original user prompts
+            style_name: Name of the reasoning style to apply
+            strengths: Strength multiplier per prompt (list or numpy array)
+            
+        Returns:
+            Enhanced prompts in the same order as the input
+        """
+        if len(prompts) != len(strengths):
+            raise ValueError("prompts and strengths must have the same length")
+        
+        if style_name == "default" or self._get_style(style_name) is None:
+            return list(prompts)
+        
+        if NUMBA_AVAILABLE:
+            level_codes = _bucket_strengths(np.asarray(strengths, dtype=np.float64))
+        else:
+            level_codes = _bucket_strengths(strengths)
+        
+        return [
+            self._build_enhanced_prompt(prompt, style_name, _STRENGTH_LEVELS[code])
+            for prompt, code in zip(prompts, level_codes)
+        ]
+    
+    def _render_enhanced_prompt(self, base_prompt: str, style_name: str, strength_level: str) -> str:
+        """Render the steered prompt for a style and strength level (memoized per instance)."""
+        style = self._get_style(style_name)
         modulation_factor = style.strength_modulation.get(strength_level, 1.0)
         
         # Apply strength modulation to the steering
         if modulation_factor < 0.8:
             # Low strength: subtle guidance
-            enhanced_prompt = self._apply_subtle_steering(base_prompt, style)
+            return self._apply_subtle_steering(base_prompt, style)
         elif modulation_factor > 1.2:
             # High strength: strong guidance
-            enhanced_prompt = self._apply_strong_steering(base_prompt, style)
+            return self._apply_strong_steering(base_prompt, style)
         else:
             # Medium strength: standard guidance
-            enhanced_prompt = self._apply_standard_steering(base_prompt, style)
-        
-        logger.debug(f"Applied {style_name} steering with strength {strength} to prompt")
-        return enhanced_prompt
+            return self._apply_standard_steering(base_prompt, style)
     
     def _determine_strength_level(self, strength: float) -> str:
         """Determine strength level category from numeric value."""
@@ -193,57 +347,31 @@ class PromptSteerer:
     def _apply_subtle_steering(self, base_prompt: str, style: ReasoningStyle) -> str:
         """Apply subtle steering for low strength."""
         # Add a brief hint about the reasoning approach
-        hint = f"Consider approaching this with {style.reasoning_pattern.split(' → ')[0]}."
-        return f"{hint}\n\n{base_prompt}"
+        return ''.join((style._subtle_prefix, base_prompt))
     
     def _apply_standard_steering(self, base_prompt: str, style: ReasoningStyle) -> str:
         """Apply standard steering for medium strength."""
         # Add system instruction and reasoning pattern guidance
-        instruction = style.system_instruction
-        
-        enhanced_prompt = f"""System: {instruction}
-
-User Query: {base_prompt}
-
-Please respond following the {style.description.lower()} approach."""
-        
-        return enhanced_prompt
+        return ''.join((style._standard_prefix, base_prompt, style._standard_suffix))
     
     def _apply_strong_steering(self, base_prompt: str, style: ReasoningStyle) -> str:
         """Apply strong steering for high strength."""
         # Add comprehensive guidance with examples and cognitive markers
-        instruction = style.system_instruction
-        pattern = style.reasoning_pattern
-        
-        # Include example phrases if available
-        examples_text = ""
-        if style.example_phrases:
-            examples_text = f"\n\nExample phrases to guide your response: {', '.join(style.example_phrases[:3])}"
-        
-        enhanced_prompt = f"""System: {instruction}
-
-Reasoning Pattern: {pattern}
-
-Cognitive Focus: Emphasize {', '.join(style.cognitive_markers[:3])} in your response.{examples_text}
-
-User Query: {base_prompt}
-
-Please provide a comprehensive response that fully embodies the {style.description.lower()} approach, demonstrating clear adherence to the specified reasoning pattern."""
-        
-        return enhanced_prompt
+        return ''.join((style._strong_prefix, base_prompt, style._strong_suffix))
     
     def get_available_styles(self) -> List[str]:
         """Get list of available reasoning styles."""
+        self._ensure_styles_loaded()
         return list(self.reasoning_styles.keys())
     
     def get_style_description(self, style_name: str) -> Optional[str]:
         """Get description of a specific reasoning style."""
-        style = self.reasoning_styles.get(style_name)
+        style = self._get_style(style_name)
         return style.description if style else None
     
     def get_style_info(self, style_name: str) -> Optional[Dict[str, Any]]:
         """Get complete information about a reasoning style."""
-        style = self.reasoning_styles.get(style_name)
+        style = self._get_style(style_name)
         if not style:
             return None
         
@@ -257,18 +385,28 @@ Please provide a comprehensive response that fully embodies the {style.descripti
     
     def set_default_style(self, style_name: str):
         """Set the default reasoning style."""
-        if style_name in self.reasoning_styles:
+        if self._get_style(style_name) is not None:
             self.default_style = style_name
-            logger.info(f"Default reasoning style set to: {style_name}")
+            logger.info("Default reasoning style set to: %s", style_name)
         else:
             logger.warning(f"Unknown style: {style_name}")
 
+# Global instance
+_prompt_steerer: Optional[PromptSteerer] = None
+_prompt_steerer_lock = threading.Lock()
+
 # Utility functions for integration
 def get_prompt_steerer() -> PromptSteerer:
     """Get a singleton instance of the PromptSteerer."""
-    if not hasattr(get_prompt_steerer, '_instance'):
-        get_prompt_steerer._instance = PromptSteerer()
-    return get_prompt_steerer._instance
+    global _prompt_steerer
+    
+    # Double-checked so concurrent first calls construct exactly one instance
+    if _prompt_steerer is None:
+        with _prompt_steerer_lock:
+            if _prompt_steerer is None:
+                _prompt_steerer = PromptSteerer()
+    
+    return _prompt_steerer
 
 def apply_reasoning_style(prompt: str, style: str = "default", strength: float = 1.0) -> str:
     """
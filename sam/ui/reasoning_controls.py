@@ -10,13 +10,62 @@ Version: 1.0.0
 """
 
 import streamlit as st
+import bisect
+import functools
 import logging
-from typing import Dict, Any, Optional, Tuple
-from sam.reasoning.prompt_steerer import get_prompt_steerer
-from sam.core.sam_model_client import get_sam_model_client
+import math
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Display labels and icons for the built-in reasoning styles
+_STYLE_DESCRIPTIONS = MappingProxyType({
+    "default": "Standard reasoning",
+    "researcher_style": "🔬 Research Analysis",
+    "step_by_step_reasoning": "📝 Step-by-Step",
+    "creative_explorer": "🎨 Creative Explorer"
+})
+
+_STYLE_ICONS = MappingProxyType({
+    "default": "🤖",
+    "researcher_style": "🔬",
+    "step_by_step_reasoning": "📝",
+    "creative_explorer": "🎨"
+})
+
+# Strength bins for bisect_right: below 0.8 is subtle, above 1.5 is strong.
+# The upper edge is nudged past 1.5 so exactly 1.5 still reads as balanced.
+_INTENSITY_BINS = (0.8, math.nextafter(1.5, math.inf))
+_INTENSITY_NAMES = ("Subtle", "Balanced", "Strong")
+_INTENSITY_LABELS = ("🔹 Subtle guidance", "🔹 Balanced guidance", "🔸 Strong guidance")
+
+# Style metadata only changes when the steerer is swapped; steerer_id is part of the cache key
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_available_styles(_steerer, steerer_id: int) -> List[str]:
+    """Cached list of reasoning styles offered by the steerer."""
+    return _steerer.get_available_styles()
+
+@functools.lru_cache(maxsize=16)
+def _style_index_map(styles: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """Selectbox options (with "default" first) and their positions, computed once per style set."""
+    options = ("default",) + styles
+    return options, {style: i for i, style in enumerate(options)}
+
+def _read_cfg() -> Tuple[str, float, bool]:
+    """Snapshot (style, strength, enabled) from session state in one pass."""
+    state = st.session_state
+    return (
+        state.get('reasoning_style', 'default'),
+        state.get('reasoning_strength', 1.0),
+        state.get('reasoning_enabled', True)
+    )
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_style_info(_steerer, steerer_id: int, style_name: str) -> Optional[Dict[str, Any]]:
+    """Cached metadata for a single reasoning style."""
+    return _steerer.get_style_info(style_name)
+
 class ReasoningStyleControls:
     """Streamlit UI controls for reasoning style management."""
     
@@ -29,6 +78,10 @@ class ReasoningStyleControls:
     def _initialize_components(self):
         """Initialize the reasoning components."""
         try:
+            # Imported here so pages that never render these controls skip the cost
+            from sam.reasoning.prompt_steerer import get_prompt_steerer
+            from sam.core.sam_model_client import get_sam_model_client
+
             self.steerer = get_prompt_steerer()
             self.model_client = get_sam_model_client()
             logger.info("Reasoning style controls initialized")
@@ -43,26 +96,18 @@ class ReasoningStyleControls:
         st.markdown("### 🧠 Reasoning Style")
         
         # Get available styles
-        available_styles = self.steerer.get_available_styles()
-        style_options = ["default"] + available_styles
-        
-        # Style descriptions for display
-        style_descriptions = {
-            "default": "Standard reasoning",
-            "researcher_style": "🔬 Research Analysis",
-            "step_by_step_reasoning": "📝 Step-by-Step",
-            "creative_explorer": "🎨 Creative Explorer"
-        }
+        available_styles = _cached_available_styles(self.steerer, id(self.steerer))
+        style_options, style_index = _style_index_map(tuple(available_styles))
         
         # Current style selection
-        current_style = st.session_state.get('reasoning_style', 'default')
+        current_style, current_strength, current_enabled = _read_cfg()
         
         # Style selector
         selected_style = st.selectbox(
             "Select reasoning approach:",
             options=style_options,
-            index=style_options.index(current_style) if current_style in style_options else 0,
-            format_func=lambda x: style_descriptions.get(x, x),
+            index=style_index.get(current_style, 0),
+            format_func=lambda x: _STYLE_DESCRIPTIONS.get(x, x),
             help="Choose how SAM should approach reasoning and problem-solving"
         )
         
@@ -71,7 +116,7 @@ class ReasoningStyleControls:
         
         # Show style information
         if selected_style != "default":
-            style_info = self.steerer.get_style_info(selected_style)
+            style_info = _cached_style_info(self.steerer, id(self.steerer), selected_style)
             if style_info:
                 with st.expander("ℹ️ Style Details", expanded=False):
                     st.markdown(f"**Description:** {style_info['description']}")
@@ -87,24 +132,19 @@ class ReasoningStyleControls:
                 "Reasoning intensity:",
                 min_value=0.1,
                 max_value=3.0,
-                value=st.session_state.get('reasoning_strength', 1.0),
+                value=current_strength,
                 step=0.1,
                 help="Higher values apply stronger reasoning style guidance"
             )
             st.session_state.reasoning_strength = strength
             
             # Visual indicator
-            if strength < 0.8:
-                st.caption("🔹 Subtle guidance")
-            elif strength > 1.5:
-                st.caption("🔸 Strong guidance")
-            else:
-                st.caption("🔹 Balanced guidance")
+            st.caption(_INTENSITY_LABELS[bisect.bisect_right(_INTENSITY_BINS, strength)])
         
         # Enable/disable toggle
         reasoning_enabled = st.checkbox(
             "Enable reasoning styles",
-            value=st.session_state.get('reasoning_enabled', True),
+            value=current_enabled,
             help="Toggle reasoning style steering on/off"
         )
         st.session_state.reasoning_enabled = reasoning_enabled
@@ -119,24 +159,19 @@ class ReasoningStyleControls:
             return
         
         col1, col2 = st.columns([2, 1])
+        current_style, _, current_enabled = _read_cfg()
         
         with col1:
             # Quick style selector
-            available_styles = ["default"] + self.steerer.get_available_styles()
-            style_icons = {
-                "default": "🤖",
-                "researcher_style": "🔬",
-                "step_by_step_reasoning": "📝",
-                "creative_explorer": "🎨"
-            }
-            
-            current_style = st.session_state.get('reasoning_style', 'default')
+            available_styles, style_index = _style_index_map(
+                tuple(_cached_available_styles(self.steerer, id(self.steerer)))
+            )
             
             selected_style = st.selectbox(
                 "Reasoning:",
                 options=available_styles,
-                index=available_styles.index(current_style) if current_style in available_styles else 0,
-                format_func=lambda x: f"{style_icons.get(x, '🧠')} {x.replace('_', ' ').title()}",
+                index=style_index.get(current_style, 0),
+                format_func=lambda x: f"{_STYLE_ICONS.get(x, '🧠')} {x.replace('_', ' ').title()}",
                 label_visibility="collapsed"
             )
             st.session_state.reasoning_style = selected_style
@@ -145,7 +180,7 @@ class ReasoningStyleControls:
             # Quick enable/disable
             enabled = st.checkbox(
                 "On",
-                value=st.session_state.get('reasoning_enabled', True),
+                value=current_enabled,
                 help="Enable reasoning styles"
             )
             st.session_state.reasoning_enabled = enabled
@@ -155,21 +190,20 @@ class ReasoningStyleControls:
     
     def get_current_reasoning_config(self) -> Dict[str, Any]:
         """Get the current reasoning configuration."""
+        style, strength, enabled = _read_cfg()
         return {
-            'style': st.session_state.get('reasoning_style', 'default'),
-            'strength': st.session_state.get('reasoning_strength', 1.0),
-            'enabled': st.session_state.get('reasoning_enabled', True)
+            'style': style,
+            'strength': strength,
+            'enabled': enabled
         }
     
     def apply_reasoning_to_prompt(self, prompt: str) -> str:
         """Apply current reasoning style to a prompt."""
-        if not self.steerer or not st.session_state.get('reasoning_enabled', True):
+        if not self.steerer:
             return prompt
         
-        style = st.session_state.get('reasoning_style', 'default')
-        strength = st.session_state.get('reasoning_strength', 1.0)
-        
-        if style == 'default':
+        style, strength, enabled = _read_cfg()
+        if not enabled or style == 'default':
             return prompt
         
         try:
@@ -181,8 +215,7 @@ class ReasoningStyleControls:
 def render_reasoning_style_status():
     """Render a status indicator for the current reasoning style."""
     try:
-        current_style = st.session_state.get('reasoning_style', 'default')
-        enabled = st.session_state.get('reasoning_enabled', True)
+        current_style, strength, enabled = _read_cfg()
         
         if not enabled:
             st.caption("🤖 Standard reasoning")
@@ -191,22 +224,9 @@ def render_reasoning_style_status():
         if current_style == 'default':
             st.caption("🤖 Standard reasoning")
         else:
-            style_icons = {
-                "researcher_style": "🔬",
-                "step_by_step_reasoning": "📝", 
-                "creative_explorer": "🎨"
-            }
-            
-            icon = style_icons.get(current_style, "🧠")
+            icon = _STYLE_ICONS.get(current_style, "🧠")
             style_name = current_style.replace('_', ' ').title()
-            strength = st.session_state.get('reasoning_strength', 1.0)
-            
-            if strength < 0.8:
-                intensity = "Subtle"
-            elif strength > 1.5:
-                intensity = "Strong"
-            else:
-                intensity = "Balanced"
+            intensity = _INTENSITY_NAMES[bisect.bisect_right(_INTENSITY_BINS, strength)]
             
             st.caption(f"{icon} {style_name} ({intensity})")
     
@@ -214,11 +234,23 @@ def render_reasoning_style_status():
         logger.warning(f"Error rendering reasoning style status: {e}")
         st.caption("🤖 Standard reasoning")
 
+@st.cache_resource(show_spinner=False)
+def _shared_reasoning_controls() -> ReasoningStyleControls:
+    """Process-wide reasoning style controls (see get_reasoning_controls)."""
+    return ReasoningStyleControls()
+
 def get_reasoning_controls() -> ReasoningStyleControls:
-    """Get a singleton instance of reasoning style controls."""
-    if 'reasoning_controls' not in st.session_state:
-        st.session_state.reasoning_controls = ReasoningStyleControls()
-    return st.session_state.reasoning_controls
+    """
+    Get a process-wide instance of reasoning style controls.
+    
+    The controls hold no per-user state (selections live in st.session_state),
+    so one instance is shared across all sessions and reruns. An instance whose
+    components failed to initialize is not kept, so the next call retries.
+    """
+    controls = _shared_reasoning_controls()
+    if controls.steerer is None or controls.model_client is None:
+        _shared_reasoning_controls.clear()
+    return controls
 
 # Convenience functions for integration
 def render_reasoning_sidebar():
@@ -13,123 +13,389 @@ import streamlit as st
 import sys
 import os
 import uuid
+import functools
 import json
 import hashlib
+import html
 import re
-from datetime import datetime
+import stat
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
 
 # Add SAM to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Parsed keystore/entitlements documents, reused while the file on disk is unchanged
+_json_documents = {}
+_registration_lock = threading.Lock()
+
+# Keystore and entitlements live in different files, so their writes can overlap
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sam-registration")
+
+_sha256 = hashlib.sha256
+
+# Features granted to every free SAM Pro key
+_SAM_PRO_FEATURES = (
+    'procedural_memory',
+    'tpv_active_reasoning',
+    'enhanced_slp_learning',
+    'memoir_lifelong_learning',
+    'dream_canvas',
+    'cognitive_distillation',
+    'cognitive_automation',
+    'advanced_memory_analytics',
+    'enhanced_web_retrieval'
+)
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Static page content, built once at import instead of on every Streamlit rerun
+_CSS_HTML = """
+<style>
+.main-header {
+    text-align: center;
+    padding: 2rem 0;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-radius: 10px;
+    margin-bottom: 2rem;
+}
+.feature-box {
+    background: #f8f9fa;
+    padding: 1.5rem;
+    border-radius: 8px;
+    border-left: 4px solid #667eea;
+    margin: 1rem 0;
+}
+.success-box {
+    background: #d4edda;
+    border: 1px solid #c3e6cb;
+    color: #155724;
+    padding: 1rem;
+    border-radius: 5px;
+    margin: 1rem 0;
+}
+</style>
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🧠 SAM Pro Registration</h1>
+    <p>Get your activation key for the world's most advanced AI memory system</p>
+</div>
+"""
+
+_INTRO_MARKDOWN = """
+## 🎯 **What is SAM Pro?**
+
+SAM Pro unlocks premium features in SAM (Secure AI Memory), including:
+"""
+
+_FEATURES_LEFT_HTML = """
+<div class="feature-box">
+    <h4>🧠 Procedural Memory Engine</h4>
+    <p>Revolutionary step-by-step intelligence with 95% query classification accuracy</p>
+</div>
+
+<div class="feature-box">
+    <h4>⚡ Real-time Execution Tracking</h4>
+    <p>Monitor AI workflows and cognitive processes in real-time</p>
+</div>
+"""
+
+_FEATURES_RIGHT_HTML = """
+<div class="feature-box">
+    <h4>🎨 Dream Canvas</h4>
+    <p>Interactive memory visualization with cognitive synthesis</p>
+</div>
+
+<div class="feature-box">
+    <h4>🤖 Proactive Suggestions</h4>
+    <p>AI that anticipates your needs and suggests next steps</p>
+</div>
+"""
+
+# Whole success panel in one template so it renders as a single element;
+# fill with str.format and HTML-escape user-supplied fields
+_SUCCESS_PANEL_TEMPLATE = """
+<div class="success-box">
+    <h3>🎉 Registration Successful!</h3>
+    <p><strong>Your SAM Pro activation key is ready!</strong></p>
+</div>
+
+### 🔑 **Your SAM Pro Activation Key:**
+
+```
+{activation_key}
+```
+
+### 🎯 **Next Steps:**
+
+1. **Copy your activation key** (shown above)
+2. **Go to SAM's main interface** at [http://localhost:8502](http://localhost:8502)
+3. **Look for "SAM Pro Activation"** in the sidebar
+4. **Paste your key** and click activate
+5. **Enjoy the world's first Procedural Intelligence System!**
+
+### 🌟 **What You Just Unlocked:**
+- 🧠 **Procedural Memory Engine** - Revolutionary step-by-step intelligence
+- 🎯 **95% Query Classification Accuracy** - Intelligent intent recognition
+- ⚡ **Real-time Execution Tracking** - Monitor your AI workflows
+- 🤖 **Proactive Suggestions** - AI that anticipates your needs
+- 🎨 **Dream Canvas** - Interactive memory visualization
+- 📊 **Advanced Analytics** - Deep insights into your data
+- 🌐 **Enhanced Web Retrieval** - Premium search capabilities
+
+**Registration Details:**
+- **Name:** {name}
+- **Email:** {email}
+- **Organization:** {organization}
+
+### ❓ **Questions?**
+Contact us at: **vin@forge1825.net**
+
+---
+"""
+
+_SUCCESS_METRICS = (
+    ("🔑 Keys Generated", "1", "New!"),
+    ("🧠 Features Unlocked", "8", "+8"),
+    ("🚀 Ready to Use", "100%", "✅"),
+)
+
+_LINKS_FAQ_MARKDOWN = """
+## 🔗 **Useful Links**
+
+- **📥 Download SAM:** [github.com/forge-1825/SAM](https://github.com/forge-1825/SAM)
+- **📖 Installation Guide:** Check the README.md in the repository
+- **🔐 Encryption Setup:** ENCRYPTION_SETUP_GUIDE.md
+- **🐛 Support:** [GitHub Issues](https://github.com/forge-1825/SAM/issues)
+
+## ❓ **Frequently Asked Questions**
+
+**Q: How long does it take to receive my activation key?**  
+A: Activation keys are sent immediately upon registration. Check your spam folder if you don't see it.
+
+**Q: Can I use SAM without a Pro key?**  
+A: Yes! SAM's core features are free. Pro features add advanced capabilities like Dream Canvas and cognitive automation.
+
+**Q: Is my data secure?**  
+A: Absolutely! SAM uses enterprise-grade AES-256 encryption and operates completely locally on your machine.
+
+**Q: Can I use SAM Pro commercially?**  
+A: Yes, SAM Pro can be used for commercial purposes. See our terms of use for details.
+"""
+
+_CONTACT_MARKDOWN = """
+---
+
+**Need help?** Contact us at: **sam-pro@forge1825.net**
+
+*SAM Pro - Secure AI Memory | The Future of AI Consciousness*
+"""
+
 def validate_email(email):
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    # Cheap structural checks first; most invalid input never reaches the regex
+    if not email or len(email) > 254 or email.count('@') != 1:
+        return False
+    local, _, domain = email.partition('@')
+    if not local or '.' not in domain:
+        return False
+    return _EMAIL_RE.match(email) is not None
 
 def generate_sam_pro_key():
-    """Generate a new SAM Pro activation key."""
+    """
+    Generate a new SAM Pro activation key.
+
+    Keys must stay in dashed UUID form (8-4-4-4-12): the entitlement validator
+    rejects anything else, so uuid4().hex is not an option here.
+    """
     return str(uuid.uuid4())
 
 def create_key_hash(key):
-    """Create SHA-256 hash of the key for validation."""
-    return hashlib.sha256(key.encode()).hexdigest()
+    """
+    Create SHA-256 hash of the key for validation.
+
+    Keys are ASCII UUIDs, so the ascii codec yields the same bytes the entitlement
+    validator hashes. hashlib's OpenSSL backend uses SHA CPU extensions when present;
+    keep it rather than a pure-Python digest.
+    """
+    return _sha256(key.encode('ascii')).hexdigest()
 
+@functools.lru_cache(maxsize=1)
 def ensure_security_directory():
-    """Ensure security directory exists."""
+    """Ensure security directory exists. Memoized: mkdir runs once per process."""
     security_dir = Path("security")
-    security_dir.mkdir(exist_ok=True)
+    security_dir.mkdir(parents=True, exist_ok=True)
     return security_dir
 
+@functools.lru_cache(maxsize=1)
 def ensure_sam_config_directory():
-    """Ensure SAM config directory exists."""
+    """Ensure SAM config directory exists. Memoized: mkdir runs once per process."""
     config_dir = Path("sam/config")
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
-def add_key_to_keystore(activation_key, email, name="SAM User"):
-    """Add key to keystore."""
+def _load_json_document(path):
+    """
+    Load a JSON document, reusing the parsed copy from a previous load or save
+    while the file's mtime and size are unchanged. Missing or corrupt files load as {}.
+    """
+    try:
+        with open(path, 'rb') as f:
+            # Stat the open descriptor so the signature matches exactly what is read
+            stat_result = os.fstat(f.fileno())
+            signature = (stat_result.st_mtime_ns, stat_result.st_size)
+            cached = _json_documents.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            document = _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        document = {}
+
+    _json_documents[path] = (signature, document)
+    return document
+
+def _save_json_document(path, document):
+    """
+    Atomically replace a JSON document and remember it as the current parsed copy.
+
+    The document is written compactly to a sibling temp file and moved into place
+    with os.replace, so readers never see a half-written file. The temp file takes
+    the existing file's permission bits (0600 for new files), so a keystore the
+    keystore manager locked down to 0600 stays that way.
+    """
+    tmp_path = path.with_suffix('.tmp')
     try:
-        security_dir = ensure_security_directory()
-        keystore_file = security_dir / "keystore.json"
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o600
+
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            if hasattr(os, 'fchmod'):
+                # os.open's mode is filtered by the umask; fchmod sets it exactly
+                os.fchmod(f.fileno(), mode)
+            f.write(_json_dumps(document))
+        os.replace(tmp_path, path)
+        stat_result = path.stat()
+    except Exception:
+        # The cached copy may hold unsaved changes; force a re-read next time
+        _json_documents.pop(path, None)
+        raise
+
+    _json_documents[path] = ((stat_result.st_mtime_ns, stat_result.st_size), document)
+
+def _update_keystore(activation_key, email, name, created):
+    """Add key to keystore, raising on failure. Callers must hold _registration_lock."""
+    security_dir = ensure_security_directory()
+    keystore_file = security_dir / "keystore.json"
+
+    # Load existing keystore or create new one
+    keystore = _load_json_document(keystore_file)
+
+    # Add new key
+    keystore[activation_key] = {
+        'email': email,
+        'name': name,
+        'created_date': created,
+        'key_type': 'sam_pro_free',
+        'status': 'active',
+        'features': list(_SAM_PRO_FEATURES)
+    }
 
-        # Load existing keystore or create new one
-        keystore = {}
-        if keystore_file.exists():
-            try:
-                with open(keystore_file, 'r') as f:
-                    keystore = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                keystore = {}
-
-        # Add new key
-        keystore[activation_key] = {
-            'email': email,
-            'name': name,
-            'created_date': datetime.now().isoformat(),
-            'key_type': 'sam_pro_free',
-            'status': 'active',
-            'features': [
-                'procedural_memory',
-                'tpv_active_reasoning',
-                'enhanced_slp_learning',
-                'memoir_lifelong_learning',
-                'dream_canvas',
-                'cognitive_distillation',
-                'cognitive_automation',
-                'advanced_memory_analytics',
-                'enhanced_web_retrieval'
-            ]
-        }
-
-        # Save keystore
-        with open(keystore_file, 'w') as f:
-            json.dump(keystore, f, indent=2)
+    # Save keystore
+    _save_json_document(keystore_file, keystore)
+
+def _update_entitlements(activation_key, created):
+    """Add key hash to entitlements, raising on failure. Callers must hold _registration_lock."""
+    # Use the correct path where SAM expects entitlements
+    config_dir = ensure_sam_config_directory()
+    entitlements_file = config_dir / "entitlements.json"
+
+    # Load existing entitlements or create new one
+    entitlements = _load_json_document(entitlements_file)
 
+    # Ensure sam_pro_keys section exists
+    if 'sam_pro_keys' not in entitlements:
+        entitlements['sam_pro_keys'] = {}
+
+    # Add key hash
+    key_hash = create_key_hash(activation_key)
+    entitlements['sam_pro_keys'][key_hash] = {
+        'created_date': created,
+        'key_type': 'free_tier',
+        'status': 'active'
+    }
+
+    # Save entitlements
+    _save_json_document(entitlements_file, entitlements)
+
+def add_key_to_keystore(activation_key, email, name="SAM User", created=None):
+    """Add key to keystore."""
+    try:
+        with _registration_lock:
+            _update_keystore(activation_key, email, name,
+                             created or datetime.now(timezone.utc).isoformat())
         return True
 
     except Exception as e:
         st.error(f"Could not update keystore: {e}")
         return False
 
-def add_key_to_entitlements(activation_key):
+def add_key_to_entitlements(activation_key, created=None):
     """Add key hash to entitlements for validation."""
     try:
-        # Use the correct path where SAM expects entitlements
-        config_dir = ensure_sam_config_directory()
-        entitlements_file = config_dir / "entitlements.json"
-
-        # Load existing entitlements or create new one
-        entitlements = {}
-        if entitlements_file.exists():
-            try:
-                with open(entitlements_file, 'r') as f:
-                    entitlements = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                entitlements = {}
-
-        # Ensure sam_pro_keys section exists
-        if 'sam_pro_keys' not in entitlements:
-            entitlements['sam_pro_keys'] = {}
-
-        # Add key hash
-        key_hash = create_key_hash(activation_key)
-        entitlements['sam_pro_keys'][key_hash] = {
-            'created_date': datetime.now().isoformat(),
-            'key_type': 'free_tier',
-            'status': 'active'
-        }
-
-        # Save entitlements
-        with open(entitlements_file, 'w') as f:
-            json.dump(entitlements, f, indent=2)
-
+        with _registration_lock:
+            _update_entitlements(activation_key, created or datetime.now(timezone.utc).isoformat())
         return True
 
     except Exception as e:
         st.error(f"Could not update entitlements: {e}")
         return False
 
+def _write_registration(activation_key, email, name):
+    """
+    Record a new key in both the keystore and the entitlements in one locked pass.
+
+    The two files are independent, so their read-modify-write cycles run
+    concurrently on _IO_POOL. Errors are reported from the calling thread,
+    which owns the Streamlit script context. Both files get the same UTC
+    creation timestamp.
+    Returns (keystore_success, entitlements_success).
+    """
+    created = datetime.now(timezone.utc).isoformat()
+    with _registration_lock:
+        futures = (
+            ("keystore", _IO_POOL.submit(_update_keystore, activation_key, email, name, created)),
+            ("entitlements", _IO_POOL.submit(_update_entitlements, activation_key, created)),
+        )
+        results = []
+        for label, future in futures:
+            try:
+                future.result()
+                results.append(True)
+            except Exception as e:
+                st.error(f"Could not update {label}: {e}")
+                results.append(False)
+    return tuple(results)
+
 def main():
     """Main registration interface."""
     st.set_page_config(
@@ -140,76 +406,21 @@ def main():
     )
     
     # Custom CSS
-    st.markdown("""
-    <style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .feature-box {
-        background: #f8f9fa;
-        padding: 1.5rem;
-        border-radius: 8px;
-        border-left: 4px solid #667eea;
-        margin: 1rem 0;
-    }
-    .success-box {
-        background: #d4edda;
-        border: 1px solid #c3e6cb;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 5px;
-        margin: 1rem 0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
     
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🧠 SAM Pro Registration</h1>
-        <p>Get your activation key for the world's most advanced AI memory system</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Introduction
-    st.markdown("""
-    ## 🎯 **What is SAM Pro?**
-    
-    SAM Pro unlocks premium features in SAM (Secure AI Memory), including:
-    """)
+    st.markdown(_INTRO_MARKDOWN)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("""
-        <div class="feature-box">
-            <h4>🧠 Procedural Memory Engine</h4>
-            <p>Revolutionary step-by-step intelligence with 95% query classification accuracy</p>
-        </div>
-
-        <div class="feature-box">
-            <h4>⚡ Real-time Execution Tracking</h4>
-            <p>Monitor AI workflows and cognitive processes in real-time</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_FEATURES_LEFT_HTML, unsafe_allow_html=True)
 
     with col2:
-        st.markdown("""
-        <div class="feature-box">
-            <h4>🎨 Dream Canvas</h4>
-            <p>Interactive memory visualization with cognitive synthesis</p>
-        </div>
-
-        <div class="feature-box">
-            <h4>🤖 Proactive Suggestions</h4>
-            <p>AI that anticipates your needs and suggests next steps</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_FEATURES_RIGHT_HTML, unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -305,58 +516,22 @@ def main():
                         activation_key = generate_sam_pro_key()
 
                         # Add to keystore and entitlements
-                        keystore_success = add_key_to_keystore(activation_key, email.strip(), name.strip())
-                        entitlements_success = add_key_to_entitlements(activation_key)
+                        keystore_success, entitlements_success = _write_registration(
+                            activation_key, email.strip(), name.strip()
+                        )
 
                         if keystore_success and entitlements_success:
                             st.balloons()
-                            st.markdown("""
-                            <div class="success-box">
-                                <h3>🎉 Registration Successful!</h3>
-                                <p><strong>Your SAM Pro activation key is ready!</strong></p>
-                            </div>
-                            """, unsafe_allow_html=True)
-
-                            # Display the key
-                            st.markdown("### 🔑 **Your SAM Pro Activation Key:**")
-                            st.code(activation_key, language=None)
-
-                            st.markdown(f"""
-                            ### 🎯 **Next Steps:**
-
-                            1. **Copy your activation key** (shown above)
-                            2. **Go to SAM's main interface** at [http://localhost:8502](http://localhost:8502)
-                            3. **Look for "SAM Pro Activation"** in the sidebar
-                            4. **Paste your key** and click activate
-                            5. **Enjoy the world's first Procedural Intelligence System!**
-
-                            ### 🌟 **What You Just Unlocked:**
-                            - 🧠 **Procedural Memory Engine** - Revolutionary step-by-step intelligence
-                            - 🎯 **95% Query Classification Accuracy** - Intelligent intent recognition
-                            - ⚡ **Real-time Execution Tracking** - Monitor your AI workflows
-                            - 🤖 **Proactive Suggestions** - AI that anticipates your needs
-                            - 🎨 **Dream Canvas** - Interactive memory visualization
-                            - 📊 **Advanced Analytics** - Deep insights into your data
-                            - 🌐 **Enhanced Web Retrieval** - Premium search capabilities
-
-                            **Registration Details:**
-                            - **Name:** {name.strip()}
-                            - **Email:** {email.strip()}
-                            - **Organization:** {organization.strip() or "Personal"}
-
-                            ### ❓ **Questions?**
-                            Contact us at: **vin@forge1825.net**
-                            """)
+                            st.markdown(_SUCCESS_PANEL_TEMPLATE.format(
+                                activation_key=activation_key,
+                                name=html.escape(name.strip()),
+                                email=html.escape(email.strip()),
+                                organization=html.escape(organization.strip() or "Personal")
+                            ), unsafe_allow_html=True)
 
                             # Success metrics
-                            st.markdown("---")
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("🔑 Keys Generated", "1", "New!")
-                            with col2:
-                                st.metric("🧠 Features Unlocked", "8", "+8")
-                            with col3:
-                                st.metric("🚀 Ready to Use", "100%", "✅")
+                            for col, (label, value, delta) in zip(st.columns(3), _SUCCESS_METRICS):
+                                col.metric(label, value, delta)
 
                         else:
                             st.error("❌ Registration failed. Please try again or contact support.")
@@ -368,37 +543,10 @@ def main():
     # Footer information
     st.markdown("---")
     
-    st.markdown("""
-    ## 🔗 **Useful Links**
-    
-    - **📥 Download SAM:** [github.com/forge-1825/SAM](https://github.com/forge-1825/SAM)
-    - **📖 Installation Guide:** Check the README.md in the repository
-    - **🔐 Encryption Setup:** ENCRYPTION_SETUP_GUIDE.md
-    - **🐛 Support:** [GitHub Issues](https://github.com/forge-1825/SAM/issues)
-    
-    ## ❓ **Frequently Asked Questions**
-    
-    **Q: How long does it take to receive my activation key?**  
-    A: Activation keys are sent immediately upon registration. Check your spam folder if you don't see it.
-    
-    **Q: Can I use SAM without a Pro key?**  
-    A: Yes! SAM's core features are free. Pro features add advanced capabilities like Dream Canvas and cognitive automation.
-    
-    **Q: Is my data secure?**  
-    A: Absolutely! SAM uses enterprise-grade AES-256 encryption and operates completely locally on your machine.
-    
-    **Q: Can I use SAM Pro commercially?**  
-    A: Yes, SAM Pro can be used for commercial purposes. See our terms of use for details.
-    """)
+    st.markdown(_LINKS_FAQ_MARKDOWN)
     
     # Contact information
-    st.markdown("""
-    ---
-    
-    **Need help?** Contact us at: **sam-pro@forge1825.net**
-    
-    *SAM Pro - Secure AI Memory | The Future of AI Consciousness*
-    """)
+    st.markdown(_CONTACT_MARKDOWN)
 
 if __name__ == "__main__":
     main()
@@ -6,96 +6,146 @@ This script helps users configure Docker volumes for accessing host file systems
 in SAM's bulk document ingestion feature.
 """
 
+import argparse
 import os
 import sys
 import platform
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from time import strftime
 from typing import List, Dict, Tuple
 
+# Resolved once at import; used to build the candidate host directories
+_HOME = os.path.expanduser("~")
+_USERNAME = os.environ.get('USERNAME', 'user')
+
+@lru_cache(maxsize=1)
 def detect_platform() -> str:
     """Detect the current platform."""
     return platform.system()
 
-def get_common_directories() -> List[Tuple[str, str]]:
-    """Get common directories based on platform."""
+@lru_cache(maxsize=1)
+def get_common_directories() -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Get common directories based on platform (cached; returned as an immutable tuple).
+
+    Each entry is (display_name, host_path, container_path).
+    """
     system = detect_platform()
     
     if system == "Windows":
-        username = os.environ.get('USERNAME', 'user')
-        return [
-            ("Documents", f"C:\\Users\\{username}\\Documents"),
-            ("Downloads", f"C:\\Users\\{username}\\Downloads"),
-            ("Desktop", f"C:\\Users\\{username}\\Desktop"),
-            ("OneDrive", f"C:\\Users\\{username}\\OneDrive\\Documents"),
-            ("All Users", "C:\\Users"),
-        ]
+        username = _USERNAME
+        return (
+            ("Documents", f"C:\\Users\\{username}\\Documents", "/app/host_documents"),
+            ("Downloads", f"C:\\Users\\{username}\\Downloads", "/app/host_downloads"),
+            ("Desktop", f"C:\\Users\\{username}\\Desktop", "/app/host_desktop"),
+            ("OneDrive", f"C:\\Users\\{username}\\OneDrive\\Documents", "/app/host_onedrive"),
+            ("All Users", "C:\\Users", "/app/host_all_users"),
+        )
     elif system == "Darwin":  # macOS
-        home = os.path.expanduser("~")
-        return [
-            ("Documents", f"{home}/Documents"),
-            ("Downloads", f"{home}/Downloads"),
-            ("Desktop", f"{home}/Desktop"),
-            ("Home", home),
-        ]
+        home = _HOME
+        return (
+            ("Documents", f"{home}/Documents", "/app/host_documents"),
+            ("Downloads", f"{home}/Downloads", "/app/host_downloads"),
+            ("Desktop", f"{home}/Desktop", "/app/host_desktop"),
+            ("Home", home, "/app/host_home"),
+        )
     else:  # Linux
-        home = os.path.expanduser("~")
-        return [
-            ("Documents", f"{home}/Documents"),
-            ("Downloads", f"{home}/Downloads"),
-            ("Desktop", f"{home}/Desktop"),
-            ("Home", home),
-        ]
-
-def generate_docker_volume_config(directories: List[Tuple[str, str]]) -> str:
+        home = _HOME
+        return (
+            ("Documents", f"{home}/Documents", "/app/host_documents"),
+            ("Downloads", f"{home}/Downloads", "/app/host_downloads"),
+            ("Desktop", f"{home}/Desktop", "/app/host_desktop"),
+            ("Home", home, "/app/host_home"),
+        )
+
+_VOLUME_CONFIG_HEADER = """\
+    volumes:
+      # SAM persistent data volumes
+      - sam_data:/app/data
+      - sam_memory:/app/memory_store
+      - sam_logs:/app/logs
+      - sam_chroma:/app/chroma_db
+      - sam_uploads:/app/uploads
+      - sam_cache:/app/cache
+      - sam_backups:/app/backups
+      - sam_security:/app/security
+      # Configuration
+      - ./docker/sam_docker_config.json:/app/config/sam_config.json:ro
+
+      # Host file system access for bulk ingestion"""
+
+def generate_docker_volume_config(directories: List[Tuple[str, str, str]]) -> str:
     """Generate Docker Compose volume configuration."""
-    system = detect_platform()
-    
-    config_lines = []
-    config_lines.append("    volumes:")
-    config_lines.append("      # SAM persistent data volumes")
-    config_lines.append("      - sam_data:/app/data")
-    config_lines.append("      - sam_memory:/app/memory_store")
-    config_lines.append("      - sam_logs:/app/logs")
-    config_lines.append("      - sam_chroma:/app/chroma_db")
-    config_lines.append("      - sam_uploads:/app/uploads")
-    config_lines.append("      - sam_cache:/app/cache")
-    config_lines.append("      - sam_backups:/app/backups")
-    config_lines.append("      - sam_security:/app/security")
-    config_lines.append("      # Configuration")
-    config_lines.append("      - ./docker/sam_docker_config.json:/app/config/sam_config.json:ro")
-    config_lines.append("")
-    config_lines.append("      # Host file system access for bulk ingestion")
-    
-    for name, path in directories:
-        if system == "Windows":
-            # Convert Windows paths for Docker
-            container_path = f"/app/host_{name.lower().replace(' ', '_')}"
-            config_lines.append(f"      - {path}:{container_path}:ro")
-        else:
-            # Unix-like systems
-            container_path = f"/app/host_{name.lower().replace(' ', '_')}"
-            config_lines.append(f"      - {path}:{container_path}:ro")
-    
-    return "\n".join(config_lines)
+    # Host paths are mounted read-only on every platform
+    mounts = "".join(
+        f"\n      - {host_path}:{container_path}:ro"
+        for _, host_path, container_path in directories
+    )
+    return f"{_VOLUME_CONFIG_HEADER}{mounts}"
+
+def check_paths_exist(paths: List[str]) -> List[bool]:
+    """Check several paths concurrently so slow network mounts don't serialize the stat calls."""
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        return list(pool.map(os.path.exists, paths))
 
 def check_docker_compose_exists() -> bool:
     """Check if docker-compose.yml exists."""
     return Path("docker-compose.yml").exists()
 
+def _copy_file(src: str, dst: str) -> None:
+    """
+    Copy a file with metadata, preferring copy_file_range on Linux.
+
+    copy_file_range stays in the kernel and can reflink on copy-on-write
+    filesystems; shutil.copy2 (sendfile/fcopyfile) is the fallback.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
 def backup_docker_compose() -> str:
     """Create a backup of the current docker-compose.yml."""
-    import shutil
-    from datetime import datetime
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = strftime("%Y%m%d_%H%M%S")
     backup_name = f"docker-compose.yml.backup_{timestamp}"
     
-    shutil.copy2("docker-compose.yml", backup_name)
+    _copy_file("docker-compose.yml", backup_name)
     return backup_name
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options; with none given the helper runs interactively."""
+    parser = argparse.ArgumentParser(description="SAM Docker Volume Setup Helper")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--select", metavar="N[,N...]",
+                           help="Comma-separated directory numbers to mount (skips the selection prompt)")
+    selection.add_argument("--all", action="store_true",
+                           help="Mount all listed directories (skips the selection prompt)")
+    parser.add_argument("--apply", "--yes", "-y", dest="apply", action="store_true",
+                        help="Back up docker-compose.yml and print apply steps without prompting")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function."""
+    args = parse_args(argv)
+    
     print("🐳 SAM Docker Volume Setup Helper")
     print("=" * 50)
     
@@ -113,12 +163,18 @@ def main():
     directories = get_common_directories()
     
     print("\n📁 Available directories to mount:")
-    for i, (name, path) in enumerate(directories, 1):
-        exists = "✅" if Path(path).exists() else "❌"
+    path_exists = check_paths_exist([path for _, path, _ in directories])
+    for i, ((name, path, _), found) in enumerate(zip(directories, path_exists), 1):
+        exists = "✅" if found else "❌"
         print(f"   {i}. {name}: {path} {exists}")
     
-    print("\n🔧 Select directories to mount (comma-separated numbers, or 'all'):")
-    selection = input("   Selection: ").strip()
+    if args.all:
+        selection = 'all'
+    elif args.select is not None:
+        selection = args.select.strip()
+    else:
+        print("\n🔧 Select directories to mount (comma-separated numbers, or 'all'):")
+        selection = input("   Selection: ").strip()
     
     if selection.lower() == 'all':
         selected_dirs = directories
@@ -135,7 +191,7 @@ def main():
         sys.exit(1)
     
     print(f"\n📋 Selected {len(selected_dirs)} directories:")
-    for name, path in selected_dirs:
+    for name, path, _ in selected_dirs:
         print(f"   - {name}: {path}")
     
     # Generate configuration
@@ -148,7 +204,10 @@ def main():
     
     # Ask if user wants to apply changes
     print("\n⚠️  This will modify your docker-compose.yml file")
-    apply = input("   Apply changes? (y/N): ").strip().lower()
+    if args.apply:
+        apply = 'y'
+    else:
+        apply = input("   Apply changes? (y/N): ").strip().lower()
     
     if apply == 'y':
         # Create backup
@@ -165,8 +224,7 @@ def main():
         print("5. Restart Docker: docker-compose down && docker-compose up -d")
         
         print("\n🎯 Path mapping reference:")
-        for name, path in selected_dirs:
-            container_path = f"/app/host_{name.lower().replace(' ', '_')}"
+        for _, path, container_path in selected_dirs:
             print(f"   {path} → {container_path}")
     
     print("\n✅ Setup complete!")
@@ -22,55 +22,71 @@ os.environ['PYTORCH_DISABLE_PER_OP_PROFILING'] = '1'
 import sys
 
 import streamlit as st
-import sys
 import logging
 import time
 import json
+import operator
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Configure logging with better error handling
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('logs/secure_streamlit.log', mode='a')
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Create logs directory if it doesn't exist
-Path('logs').mkdir(exist_ok=True)
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def _configure_logging():
+    """
+    Attach console and file logging to the root logger, once per process.
+
+    Called from main() rather than at import: Streamlit re-executes this script on
+    every rerun, and the log file must only be opened after logs/ exists.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.FileHandler) for h in root.handlers):
+        return
+
+    # Create logs directory if it doesn't exist
+    Path('logs').mkdir(exist_ok=True)
+    file_handler = logging.FileHandler('logs/secure_streamlit.log', mode='a')
+
+    if root.handlers:
+        # Something else already configured console logging; just add the file
+        file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        root.addHandler(file_handler)
+    else:
+        logging.basicConfig(
+            level=logging.INFO,
+            format=_LOG_FORMAT,
+            handlers=[logging.StreamHandler(), file_handler]
+        )
 
 def health_check():
     """Health check endpoint for Docker containers and load balancers."""
+    # Fast path: ordinary reruns are not health check requests
+    if 'health' not in st.query_params and not st.session_state.get('health_check_mode', False):
+        return
+
     try:
-        # Check if we're in a health check request
-        query_params = st.query_params
-        if 'health' in query_params or st.session_state.get('health_check_mode', False):
-            # Return simple health status
-            health_status = {
-                "status": "healthy",
-                "timestamp": datetime.now().isoformat(),
-                "version": "1.0.0",
-                "services": {
-                    "streamlit": "running",
-                    "memory_store": "available",
-                    "security": "enabled"
-                }
+        # Return simple health status
+        health_status = {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "version": "1.0.0",
+            "services": {
+                "streamlit": "running",
+                "memory_store": "available",
+                "security": "enabled"
             }
+        }
 
-            # Display health status
-            st.json(health_status)
-            st.stop()
+        # Display health status
+        st.json(health_status)
+        st.stop()
 
     except Exception as e:
         logger.error(f"Health check error: {e}")
@@ -323,6 +339,17 @@ def generate_enhanced_analysis_prompt(filename: str) -> str:
 
     return base_prompt
 
+@st.cache_resource(show_spinner=False)
+def _first_time_setup_state() -> Dict[str, bool]:
+    """Process-wide record of whether first-time setup has been seen complete."""
+    return {'complete': False}
+
+@st.cache_resource(show_spinner=False)
+def _get_setup_manager():
+    """Process-wide first-time setup manager (raises ImportError if the module is missing)."""
+    from utils.first_time_setup import get_first_time_setup_manager
+    return get_first_time_setup_manager()
+
 def render_registration_page():
     """Render the dedicated SAM Pro registration page."""
     try:
@@ -339,6 +366,7 @@ def render_registration_page():
 
 def main():
     """Main Streamlit application with security integration and first-time setup."""
+    _configure_logging()
 
     # Configure Streamlit page FIRST (must be the very first Streamlit command)
     st.set_page_config(
@@ -367,15 +395,20 @@ def main():
     # Handle health check requests after page config
     health_check()
 
-    # Check for first-time user and route to setup wizard
+    # Check for first-time user and route to setup wizard. Completed setup does not
+    # revert, so once any session sees it complete the check (and the setup module
+    # import) is skipped for the rest of the process.
     try:
-        from utils.first_time_setup import get_first_time_setup_manager
-        setup_manager = get_first_time_setup_manager()
+        setup_state = _first_time_setup_state()
+        if not setup_state['complete']:
+            setup_manager = _get_setup_manager()
 
-        if setup_manager.is_first_time_user():
-            # Route to setup wizard for first-time users
-            render_setup_wizard()
-            return
+            if setup_manager.is_first_time_user():
+                # Route to setup wizard for first-time users
+                render_setup_wizard()
+                return
+
+            setup_state['complete'] = True
 
     except ImportError:
         # If first-time setup module not available, continue with normal flow
@@ -388,6 +421,8 @@ def main():
         try:
             from security import SecureStateManager
             st.session_state.security_manager = SecureStateManager()
+            # Capability probe done once per session rather than on every rerun
+            st.session_state._sm_has_unlock = hasattr(st.session_state.security_manager, 'is_unlocked')
             logger.info("Security manager initialized")
         except ImportError:
             st.error("❌ Security module not available")
@@ -397,10 +432,12 @@ def main():
             st.error(f"❌ Failed to initialize security: {e}")
             st.stop()
 
-    # Create security UI
+    # Create security UI (once per session; it only wraps the session's security manager)
     try:
-        from security import create_security_ui
-        security_ui = create_security_ui(st.session_state.security_manager)
+        if '_security_ui' not in st.session_state:
+            from security import create_security_ui
+            st.session_state._security_ui = create_security_ui(st.session_state.security_manager)
+        security_ui = st.session_state._security_ui
     except Exception as e:
         st.error(f"❌ Failed to create security UI: {e}")
         st.stop()
@@ -443,8 +480,7 @@ def render_basic_first_time_setup():
 
     # Check what step we're on
     try:
-        from utils.first_time_setup import get_first_time_setup_manager
-        setup_manager = get_first_time_setup_manager()
+        setup_manager = _get_setup_manager()
         progress = setup_manager.get_setup_progress()
         next_step = progress['next_step']
 
@@ -516,6 +552,7 @@ def render_basic_first_time_setup():
                                     result = feature_manager.validate_key(manual_key.strip())
 
                                     if result.get('success'):
+                                        st.session_state.pop('_pro_status', None)
                                         setup_manager.update_setup_status('sam_pro_activated', True)
                                         st.balloons()
                                         st.success("🎉 **SAM Pro Activated Successfully!**")
@@ -583,27 +620,13 @@ def render_main_sam_application():
 
     st.markdown("---")
 
-    # Initialize SAM components with security (needed for both interfaces)
-    # Only initialize if security manager is unlocked
-    if 'sam_initialized' not in st.session_state and st.session_state.security_manager.is_unlocked():
-        with st.spinner("🔧 Initializing SAM components..."):
-            try:
-                initialize_secure_sam()
-                st.session_state.sam_initialized = True
-                st.success("✅ SAM initialized successfully!")
-            except Exception as e:
-                st.error(f"❌ Failed to initialize SAM: {e}")
-                logger.error(f"SAM initialization failed: {e}")
-                return
-
-    # Check if Memory Control Center should be shown FIRST (before SAM initialization)
+    # Check if Memory Control Center should be shown FIRST (before SAM initialization;
+    # it uses its own memory components, so the SAM subsystems are not needed there)
     if st.session_state.get('show_memory_control_center', False):
         # Add a button to return to normal interface
-        col1, col2, col3 = st.columns([2, 1, 2])
-        with col2:
-            if st.button("🔙 Return to Main Interface", use_container_width=True):
-                st.session_state.show_memory_control_center = False
-                st.rerun()
+        if st.button("🔙 Return to Main Interface"):
+            st.session_state.show_memory_control_center = False
+            st.rerun()
 
         st.markdown("---")
 
@@ -611,6 +634,19 @@ def render_main_sam_application():
         render_integrated_memory_control_center()
 
     else:
+        # Initialize SAM components with security (needed by the tab interface)
+        # Only initialize if security manager is unlocked
+        if 'sam_initialized' not in st.session_state and st.session_state.security_manager.is_unlocked():
+            with st.spinner("🔧 Initializing SAM components..."):
+                try:
+                    initialize_secure_sam()
+                    st.session_state.sam_initialized = True
+                    st.success("✅ SAM initialized successfully!")
+                except Exception as e:
+                    st.error(f"❌ Failed to initialize SAM: {e}")
+                    logger.error(f"SAM initialization failed: {e}")
+                    return
+
         # Normal tab interface
         # Main application tabs
         tab1, tab2, tab3, tab4, tab5 = st.tabs(["💬 Chat", "📚 Documents", "🧠 Memory", "🔍 Vetting", "🛡️ Security"])
@@ -647,6 +683,10 @@ def get_memory_store_status():
     else:
         return "not_initialized"
 
+# initialize_secure_sam() bits for optional components already attempted this session
+_INIT_SLP, _INIT_TPV, _INIT_MEMOIR, _INIT_DISTILLATION = (1 << i for i in range(4))
+_INIT_ALL = _INIT_SLP | _INIT_TPV | _INIT_MEMOIR | _INIT_DISTILLATION
+
 def initialize_secure_sam():
     """Initialize SAM components with security integration and background loading."""
 
@@ -657,8 +697,6 @@ def initialize_secure_sam():
         st.session_state.memory_store_ready = False
 
         # Start background initialization
-        import threading
-
         def background_memory_init():
             """Initialize memory store in background thread."""
             try:
@@ -707,7 +745,9 @@ def initialize_secure_sam():
 
     else:
         # Memory store already exists - handle encryption activation
-        if (hasattr(st.session_state.secure_memory_store, 'activate_encryption') and
+        if '_store_has_activate' not in st.session_state:
+            st.session_state._store_has_activate = hasattr(st.session_state.secure_memory_store, 'activate_encryption')
+        if (st.session_state._store_has_activate and
             st.session_state.security_manager.is_unlocked()):
             try:
                 encryption_activated = st.session_state.secure_memory_store.activate_encryption()
@@ -718,8 +758,8 @@ def initialize_secure_sam():
 
     # Handle encryption activation for background-loaded store
     if (st.session_state.get('memory_store_ready', False) and
-        hasattr(st.session_state, 'secure_memory_store') and
-        hasattr(st.session_state.security_manager, 'is_unlocked') and
+        'secure_memory_store' in st.session_state and
+        st.session_state.get('_sm_has_unlock', True) and
         st.session_state.security_manager.is_unlocked()):
         try:
             if st.session_state.secure_memory_store.activate_encryption():
@@ -729,44 +769,17 @@ def initialize_secure_sam():
         except Exception as e:
             logger.warning(f"⚠️ Encryption activation error: {e}")
     
-    # Initialize embedding manager
-    if 'embedding_manager' not in st.session_state:
-        try:
-            from utils.embedding_utils import get_embedding_manager
-            st.session_state.embedding_manager = get_embedding_manager()
-            logger.info("✅ Embedding manager initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Embedding manager not available: {e}")
-
-    # Initialize vector manager
-    if 'vector_manager' not in st.session_state:
-        try:
-            from utils.vector_manager import VectorManager
-            st.session_state.vector_manager = VectorManager()
-            logger.info("✅ Vector manager initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Vector manager not available: {e}")
+    # The multimodal pipeline is created on first use by _get_multimodal_pipeline()
 
-    # Initialize multimodal pipeline
-    if 'multimodal_pipeline' not in st.session_state:
-        try:
-            from multimodal_processing.multimodal_pipeline import get_multimodal_pipeline
-            st.session_state.multimodal_pipeline = get_multimodal_pipeline()
-            logger.info("✅ Multimodal pipeline initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Multimodal pipeline not available: {e}")
-
-    # Initialize tool-augmented reasoning (optional)
-    if 'reasoning_framework' not in st.session_state:
-        try:
-            from reasoning.self_decide_framework import SelfDecideFramework
-            st.session_state.reasoning_framework = SelfDecideFramework()
-            logger.info("✅ Tool-augmented reasoning initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Tool-augmented reasoning not available: {e}")
+    # Optional components are attempted once per session; _init_mask records
+    # which ones have been tried so later reruns skip straight past them
+    init_mask = st.session_state.get('_init_mask', 0)
+    if init_mask == _INIT_ALL:
+        return
 
     # Initialize Enhanced SLP System (Phase 1A+1B Integration)
-    if 'enhanced_slp_initialized' not in st.session_state:
+    if not init_mask & _INIT_SLP:
+        init_mask |= _INIT_SLP
         try:
             from integrate_slp_enhancements import integrate_enhanced_slp_into_sam
             slp_integration = integrate_enhanced_slp_into_sam()
@@ -783,33 +796,32 @@ def initialize_secure_sam():
             logger.warning(f"⚠️ Enhanced SLP not available: {e}")
 
     # Initialize TPV System (preserving 100% of existing functionality)
-    if 'tpv_initialized' not in st.session_state:
+    if not init_mask & _INIT_TPV:
+        init_mask |= _INIT_TPV
         try:
             from sam.cognition.tpv import sam_tpv_integration, UserProfile
 
             # Initialize TPV integration if not already done
-            if not sam_tpv_integration.is_initialized:
-                tpv_init_success = sam_tpv_integration.initialize()
-                if tpv_init_success:
-                    st.session_state.sam_tpv_integration = sam_tpv_integration
-                    st.session_state.tpv_initialized = True
-                    st.session_state.tpv_active = True  # Mark as active for sidebar
-                    logger.info("✅ TPV system initialized and ready for Active Reasoning Control")
-                else:
-                    st.session_state.tpv_initialized = False
-                    logger.warning("⚠️ TPV initialization failed")
-            else:
+            already_initialized = sam_tpv_integration.is_initialized
+            if already_initialized or sam_tpv_integration.initialize():
                 st.session_state.sam_tpv_integration = sam_tpv_integration
                 st.session_state.tpv_initialized = True
-                st.session_state.tpv_active = True
-                logger.info("✅ TPV system already initialized and ready")
+                st.session_state.tpv_active = True  # Mark as active for sidebar
+                if already_initialized:
+                    logger.info("✅ TPV system already initialized and ready")
+                else:
+                    logger.info("✅ TPV system initialized and ready for Active Reasoning Control")
+            else:
+                st.session_state.tpv_initialized = False
+                logger.warning("⚠️ TPV initialization failed")
         except Exception as e:
             st.session_state.tpv_initialized = False
             st.session_state.tpv_active = False
             logger.warning(f"⚠️ TPV system not available: {e}")
 
     # Initialize MEMOIR System (preserving 100% of functionality)
-    if 'memoir_enabled' not in st.session_state:
+    if not init_mask & _INIT_MEMOIR:
+        init_mask |= _INIT_MEMOIR
         try:
             from sam.orchestration.memoir_sof_integration import get_memoir_sof_integration
             sam_memoir_integration = get_memoir_sof_integration()
@@ -822,184 +834,270 @@ def initialize_secure_sam():
             st.session_state.memoir_enabled = False
 
     # Initialize Cognitive Distillation Engine (NEW - Phase 2 Integration)
-    if 'cognitive_distillation_initialized' not in st.session_state:
+    if not init_mask & _INIT_DISTILLATION:
+        init_mask |= _INIT_DISTILLATION
         try:
-            from sam.discovery.distillation import SAMCognitiveDistillation
-
-            # Initialize with automation enabled for production
-            st.session_state.cognitive_distillation = SAMCognitiveDistillation(enable_automation=True)
+            st.session_state.cognitive_distillation = _get_cognitive_distillation()
             st.session_state.cognitive_distillation_initialized = True
             st.session_state.cognitive_distillation_enabled = True
 
-            logger.info("✅ Cognitive Distillation Engine initialized with automated principle discovery")
+        except Exception as e:
+            logger.warning(f"Cognitive Distillation Engine not available: {e}")
+            st.session_state.cognitive_distillation = None
+            st.session_state.cognitive_distillation_initialized = False
+            st.session_state.cognitive_distillation_enabled = False
 
-            # Setup default triggers for common SAM strategies
-            try:
-                automation = st.session_state.cognitive_distillation.automation
-                if automation:
-                    # Add triggers for SAM's main reasoning strategies
-                    automation.add_trigger(
-                        strategy_id="secure_chat_reasoning",
-                        trigger_type="interaction_threshold",
-                        trigger_condition={
-                            'min_interactions': 20,
-                            'min_success_rate': 0.8,
-                            'cooldown_hours': 48
-                        }
-                    )
+    st.session_state._init_mask = init_mask
+
+# Default distillation triggers for SAM's main reasoning strategies:
+# (strategy_id, trigger_type, trigger_condition)
+_DISTILLATION_TRIGGERS = (
+    ("secure_chat_reasoning", "interaction_threshold",
+     {'min_interactions': 20, 'min_success_rate': 0.8, 'cooldown_hours': 48}),
+    ("document_analysis", "interaction_threshold",
+     {'min_interactions': 15, 'min_success_rate': 0.85, 'cooldown_hours': 72}),
+    ("web_search_integration", "time_based",
+     {'interval_hours': 168}),  # Weekly
+)
 
-                    automation.add_trigger(
-                        strategy_id="document_analysis",
-                        trigger_type="interaction_threshold",
-                        trigger_condition={
-                            'min_interactions': 15,
-                            'min_success_rate': 0.85,
-                            'cooldown_hours': 72
-                        }
-                    )
+def _configure_distillation_triggers(automation):
+    """Add the default _DISTILLATION_TRIGGERS to the distillation automation."""
+    try:
+        if automation:
+            for strategy_id, trigger_type, trigger_condition in _DISTILLATION_TRIGGERS:
+                automation.add_trigger(
+                    strategy_id=strategy_id,
+                    trigger_type=trigger_type,
+                    trigger_condition=dict(trigger_condition)
+                )
 
-                    automation.add_trigger(
-                        strategy_id="web_search_integration",
-                        trigger_type="time_based",
-                        trigger_condition={
-                            'interval_hours': 168  # Weekly
-                        }
-                    )
+            logger.info("✅ Cognitive distillation automation triggers configured")
+
+    except Exception as trigger_error:
+        logger.warning(f"Failed to setup distillation triggers: {trigger_error}")
+
+@st.cache_resource(show_spinner=False)
+def _get_distillation_automation():
+    """
+    Process-wide distillation automation.
 
-                    logger.info("✅ Cognitive distillation automation triggers configured")
+    The automation runs a background thread, so it is started and its triggers
+    configured once per process; every session's engine shares it.
+    """
+    from sam.discovery.distillation import AutomatedDistillation
+
+    automation = AutomatedDistillation()
+    automation.setup_default_triggers()
+    automation.start_automation()
+
+    # Setup default triggers for common SAM strategies
+    _configure_distillation_triggers(automation)
+    return automation
+
+def _get_cognitive_distillation():
+    """
+    Create this session's Cognitive Distillation Engine.
+
+    The engine keeps reasoning traces (which contain the user's queries) in memory,
+    so each session gets its own; only the automation is shared.
+    """
+    from sam.discovery.distillation import SAMCognitiveDistillation
 
-            except Exception as trigger_error:
-                logger.warning(f"Failed to setup distillation triggers: {trigger_error}")
+    # Automation enabled for production, attached from the shared instance
+    distillation = SAMCognitiveDistillation(enable_automation=False)
+    distillation.automation = _get_distillation_automation()
+    logger.info("✅ Cognitive Distillation Engine initialized with automated principle discovery")
+    return distillation
 
+def _get_multimodal_pipeline():
+    """Lazily create the multimodal pipeline for this session (None if unavailable)."""
+    if 'multimodal_pipeline' not in st.session_state:
+        try:
+            from multimodal_processing.multimodal_pipeline import get_multimodal_pipeline
+            st.session_state.multimodal_pipeline = get_multimodal_pipeline()
+            logger.info("✅ Multimodal pipeline initialized")
         except Exception as e:
-            logger.warning(f"Cognitive Distillation Engine not available: {e}")
-            st.session_state.cognitive_distillation = None
-            st.session_state.cognitive_distillation_initialized = False
-            st.session_state.cognitive_distillation_enabled = False
+            logger.warning(f"⚠️ Multimodal pipeline not available: {e}")
+            return None
+    return st.session_state.multimodal_pipeline
 
 # TPV control sidebar function removed to clean up the interface
 
-def render_messages_from_sam_alert():
-    """Render Messages from SAM alert with notification badges and blinking effects."""
+# Static markup for the Messages from SAM alert
+_ALERT_CSS = """
+<style>
+.blinking-alert {
+    animation: blink 2s linear infinite;
+    background: linear-gradient(45deg, #ff4b4b, #ff6b6b);
+    color: white;
+    padding: 0.5rem;
+    border-radius: 0.5rem;
+    text-align: center;
+    font-weight: bold;
+    margin-bottom: 1rem;
+    box-shadow: 0 2px 4px rgba(255, 75, 75, 0.3);
+}
+
+@keyframes blink {
+    0%, 50% { opacity: 1; }
+    51%, 100% { opacity: 0.7; }
+}
+
+.notification-badge {
+    background: #ff4b4b;
+    color: white;
+    border-radius: 50%;
+    padding: 0.2rem 0.5rem;
+    font-size: 0.8rem;
+    font-weight: bold;
+    margin-left: 0.5rem;
+}
+
+.messages-container {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin-bottom: 1rem;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+}
+
+.message-item {
+    background: rgba(255, 255, 255, 0.1);
+    padding: 0.5rem;
+    border-radius: 0.3rem;
+    margin: 0.5rem 0;
+    border-left: 3px solid #ffd700;
+}
+</style>
+"""
+
+_ALERT_ALL_CLEAR_HTML = """
+<div style="
+    background: linear-gradient(135deg, #a8e6cf 0%, #88d8a3 100%);
+    color: #2d5a3d;
+    padding: 0.5rem;
+    border-radius: 0.5rem;
+    text-align: center;
+    margin-bottom: 1rem;
+    font-size: 0.9rem;
+">
+    ✉️ <strong>Messages from SAM</strong><br>
+    <small>All caught up! 🎉</small>
+</div>
+"""
+
+_ALERT_INITIALIZING_HTML = """
+<div style="
+    background: #f0f0f0;
+    color: #666;
+    padding: 0.5rem;
+    border-radius: 0.5rem;
+    text-align: center;
+    margin-bottom: 1rem;
+    font-size: 0.9rem;
+">
+    ✉️ <strong>Messages from SAM</strong><br>
+    <small>System initializing...</small>
+</div>
+"""
+
+_ALERT_BANNER_TEMPLATE = """
+<div class="blinking-alert">
+    ✉️ <strong>Messages from SAM</strong>
+    <span class="notification-badge">{count}</span>
+</div>
+"""
+
+_ALERT_INSIGHTS_ITEM_TEMPLATE = """
+<div class="message-item">
+    💡 <strong>New Insights Available!</strong><br>
+    <small>Generated{time_str} - Ready for research</small>
+</div>
+"""
+
+_ALERT_REVIEW_ITEM_TEMPLATE = """
+<div class="message-item">
+    🔍 <strong>Papers Awaiting Review</strong><br>
+    <small>{count} research paper{plural} need your approval</small>
+</div>
+"""
+
+# How long "Dismiss Alerts" hides the Messages from SAM alert
+_ALERT_DISMISS_SECONDS = 3600
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _alert_state() -> Tuple[Dict[str, Any], int]:
+    """Recent snapshot of (new-insights status, pending vetting file count)."""
+    from sam.orchestration.discovery_cycle import get_discovery_orchestrator
+    insights_status = get_discovery_orchestrator().get_new_insights_status()
+
+    try:
+        from sam.state.vetting_queue import get_vetting_queue_manager
+        pending_review = len(get_vetting_queue_manager().get_pending_review_files())
+    except Exception:
+        pending_review = 0
+
+    return insights_status, pending_review
+
+@st.cache_data(show_spinner=False)
+def _format_insight_time(timestamp: Optional[str]) -> str:
+    """Format an ISO insights timestamp as ' at HH:MM' ('' if missing or unparseable)."""
+    if not timestamp:
+        return ""
     try:
-        # Import discovery orchestrator for state checking
-        from sam.orchestration.discovery_cycle import get_discovery_orchestrator
-        from sam.state.state_manager import get_state_manager
+        return f" at {datetime.fromisoformat(timestamp).strftime('%H:%M')}"
+    except (TypeError, ValueError):
+        return ""
 
-        orchestrator = get_discovery_orchestrator()
-        state_manager = get_state_manager()
+def render_messages_from_sam_alert():
+    """Render Messages from SAM alert with notification badges and blinking effects."""
+    # Dismissed alerts stay hidden (and unqueried) for _ALERT_DISMISS_SECONDS
+    if st.session_state.get('alerts_dismissed'):
+        dismissed_at = st.session_state.get('alerts_dismissed_at', 0.0)
+        if time.time() - dismissed_at < _ALERT_DISMISS_SECONDS:
+            return
+        st.session_state.alerts_dismissed = False
 
-        # Check for new insights
-        insights_status = orchestrator.get_new_insights_status()
+    try:
+        # Check for new insights and pending vetting items
+        # (the snapshot refreshes every 30s or when an alert is acted on)
+        insights_status, pending_review = _alert_state()
         new_insights_available = insights_status.get('new_insights_available', False)
 
-        # Check for pending vetting items
-        try:
-            from sam.state.vetting_queue import get_vetting_queue_manager
-            vetting_manager = get_vetting_queue_manager()
-            pending_review = len(vetting_manager.get_pending_review_files())
-        except:
-            pending_review = 0
-
         # Calculate total notifications
         total_notifications = (1 if new_insights_available else 0) + (1 if pending_review > 0 else 0)
 
         if total_notifications > 0:
             # Create blinking CSS for urgent notifications
-            st.markdown("""
-            <style>
-            .blinking-alert {
-                animation: blink 2s linear infinite;
-                background: linear-gradient(45deg, #ff4b4b, #ff6b6b);
-                color: white;
-                padding: 0.5rem;
-                border-radius: 0.5rem;
-                text-align: center;
-                font-weight: bold;
-                margin-bottom: 1rem;
-                box-shadow: 0 2px 4px rgba(255, 75, 75, 0.3);
-            }
-
-            @keyframes blink {
-                0%, 50% { opacity: 1; }
-                51%, 100% { opacity: 0.7; }
-            }
-
-            .notification-badge {
-                background: #ff4b4b;
-                color: white;
-                border-radius: 50%;
-                padding: 0.2rem 0.5rem;
-                font-size: 0.8rem;
-                font-weight: bold;
-                margin-left: 0.5rem;
-            }
-
-            .messages-container {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 1rem;
-                border-radius: 0.5rem;
-                margin-bottom: 1rem;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-
-            .message-item {
-                background: rgba(255, 255, 255, 0.1);
-                padding: 0.5rem;
-                border-radius: 0.3rem;
-                margin: 0.5rem 0;
-                border-left: 3px solid #ffd700;
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            st.markdown(_ALERT_CSS, unsafe_allow_html=True)
 
             # Main alert container
-            st.markdown(f"""
-            <div class="blinking-alert">
-                ✉️ <strong>Messages from SAM</strong>
-                <span class="notification-badge">{total_notifications}</span>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_ALERT_BANNER_TEMPLATE.format(count=total_notifications), unsafe_allow_html=True)
 
             # Messages container
             st.markdown('<div class="messages-container">', unsafe_allow_html=True)
 
             # New insights notification
             if new_insights_available:
-                timestamp = insights_status.get('last_insights_timestamp')
-                time_str = ""
-                if timestamp:
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(timestamp)
-                        time_str = f" at {dt.strftime('%H:%M')}"
-                    except:
-                        pass
-
-                st.markdown(f"""
-                <div class="message-item">
-                    💡 <strong>New Insights Available!</strong><br>
-                    <small>Generated{time_str} - Ready for research</small>
-                </div>
-                """, unsafe_allow_html=True)
+                time_str = _format_insight_time(insights_status.get('last_insights_timestamp'))
+                st.markdown(_ALERT_INSIGHTS_ITEM_TEMPLATE.format(time_str=time_str), unsafe_allow_html=True)
 
                 # Action button for insights
                 if st.button("🧠 View New Insights", key="view_insights_alert", use_container_width=True):
                     # Clear the flag and navigate to Dream Canvas
-                    orchestrator.clear_new_insights_flag()
+                    from sam.orchestration.discovery_cycle import get_discovery_orchestrator
+                    get_discovery_orchestrator().clear_new_insights_flag()
+                    _alert_state.clear()
                     st.session_state.show_memory_control_center = True
                     st.session_state.memory_page_override = "🧠🎨 Dream Canvas"
                     st.rerun()
 
             # Pending vetting notification
             if pending_review > 0:
-                st.markdown(f"""
-                <div class="message-item">
-                    🔍 <strong>Papers Awaiting Review</strong><br>
-                    <small>{pending_review} research paper{'' if pending_review == 1 else 's'} need{'' if pending_review == 1 else ''} your approval</small>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_ALERT_REVIEW_ITEM_TEMPLATE.format(
+                    count=pending_review, plural='' if pending_review == 1 else 's'
+                ), unsafe_allow_html=True)
 
                 # Action button for vetting
                 if st.button("📋 Review Papers", key="review_papers_alert", use_container_width=True):
@@ -1013,43 +1111,43 @@ def render_messages_from_sam_alert():
             # Quick dismiss option
             if st.button("🔕 Dismiss Alerts", key="dismiss_alerts", help="Temporarily hide alerts"):
                 st.session_state.alerts_dismissed = True
+                st.session_state.alerts_dismissed_at = time.time()
+                _alert_state.clear()
                 st.rerun()
 
         else:
             # No notifications - show subtle indicator
-            st.markdown("""
-            <div style="
-                background: linear-gradient(135deg, #a8e6cf 0%, #88d8a3 100%);
-                color: #2d5a3d;
-                padding: 0.5rem;
-                border-radius: 0.5rem;
-                text-align: center;
-                margin-bottom: 1rem;
-                font-size: 0.9rem;
-            ">
-                ✉️ <strong>Messages from SAM</strong><br>
-                <small>All caught up! 🎉</small>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_ALERT_ALL_CLEAR_HTML, unsafe_allow_html=True)
 
     except Exception as e:
         # Fallback display if components not available
-        st.markdown("""
-        <div style="
-            background: #f0f0f0;
-            color: #666;
-            padding: 0.5rem;
-            border-radius: 0.5rem;
-            text-align: center;
-            margin-bottom: 1rem;
-            font-size: 0.9rem;
-        ">
-            ✉️ <strong>Messages from SAM</strong><br>
-            <small>System initializing...</small>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_ALERT_INITIALIZING_HTML, unsafe_allow_html=True)
+
+
+
+# Shown when an activation key is not in the UUID form accepted by the validator
+_ACTIVATION_KEY_FORMAT_HINT = "💡 **Key Format:** Keys should be in UUID format (e.g., 12345678-1234-1234-1234-123456789abc)"
 
+_SAM_PRO_UNLOCKS_MARKDOWN = """
+**🧠 Advanced AI Capabilities:**
+• **TPV Active Reasoning Control** - 48.4% efficiency gains
+• **Enhanced SLP Learning** - Advanced pattern recognition
+• **MEMOIR Lifelong Learning** - Continuous knowledge updates
+• **Dream Canvas** - Interactive memory visualization
+• **Cognitive Distillation Engine** - AI introspection & self-improvement
 
+**🔧 Premium Tools:**
+• **Cognitive Automation Engine** - Automated reasoning
+• **Advanced Memory Analytics** - Deep insights
+• **Enhanced Web Retrieval** - Premium search capabilities
+• **Extended Context Windows** - Larger conversation memory
+
+**🛡️ Enterprise Features:**
+• **Priority Support** - Faster response times
+• **Advanced Security** - Additional encryption layers
+• **Custom Integrations** - API access and webhooks
+• **Usage Analytics** - Detailed performance metrics
+"""
 
 def render_sam_pro_sidebar():
     """Render SAM Pro activation sidebar with key entry (preserving 100% of existing functionality)."""
@@ -1084,22 +1182,28 @@ def render_sam_pro_sidebar():
 
         st.header("🔑 SAM Pro Activation")
 
-        # Check current activation status
+        # Check current activation status (cached per session; cleared on activation)
         try:
-            from sam.entitlements.feature_manager import get_feature_manager
-            feature_manager = get_feature_manager()
-            is_pro_unlocked = feature_manager.is_pro_unlocked()
+            pro_status = st.session_state.get('_pro_status')
+            if pro_status is None:
+                from sam.entitlements.feature_manager import get_feature_manager
+                feature_manager = get_feature_manager()
+                pro_status = {'unlocked': feature_manager.is_pro_unlocked(), 'activation_date': None}
+                if pro_status['unlocked']:
+                    try:
+                        pro_status['activation_date'] = feature_manager.get_activation_state().get('activation_date')
+                    except Exception:
+                        pass
+                st.session_state._pro_status = pro_status
 
-            if is_pro_unlocked:
+            if pro_status['unlocked']:
                 # Show activated status
                 st.success("✅ **SAM Pro Activated**")
 
                 # Show activation details
                 try:
-                    activation_state = feature_manager.get_activation_state()
-                    if activation_state.get('activation_date'):
-                        import datetime
-                        activation_date = datetime.datetime.fromtimestamp(activation_state['activation_date'])
+                    if pro_status['activation_date']:
+                        activation_date = datetime.fromtimestamp(pro_status['activation_date'])
                         st.caption(f"Activated: {activation_date.strftime('%Y-%m-%d %H:%M')}")
                 except Exception:
                     pass
@@ -1120,22 +1224,28 @@ def render_sam_pro_sidebar():
                     submitted = st.form_submit_button("🚀 Activate SAM Pro", type="primary")
 
                     if submitted:
-                        if activation_key:
+                        from sam.entitlements.validator import is_valid_key_format
+                        if activation_key and not is_valid_key_format(activation_key.strip()):
+                            st.error("❌ Invalid key format. Please check your activation key.")
+                            st.info(_ACTIVATION_KEY_FORMAT_HINT)
+                        elif activation_key:
                             with st.spinner("🔍 Validating activation key..."):
                                 try:
-                                    result = feature_manager.validate_key(activation_key)
+                                    from sam.entitlements.feature_manager import get_feature_manager
+                                    result = get_feature_manager().validate_key(activation_key)
 
                                     if result.get('success'):
                                         st.success("🎉 **SAM Pro Activated Successfully!**")
                                         st.balloons()
                                         st.markdown(result.get('message', 'Premium features unlocked!'))
+                                        st.session_state.pop('_pro_status', None)
                                         st.rerun()  # Refresh to show activated state
                                     else:
                                         st.error(result.get('message', '❌ Invalid activation key'))
 
                                         # Show helpful error information
                                         if result.get('invalid_format'):
-                                            st.info("💡 **Key Format:** Keys should be in UUID format (e.g., 12345678-1234-1234-1234-123456789abc)")
+                                            st.info(_ACTIVATION_KEY_FORMAT_HINT)
                                         elif result.get('invalid_key'):
                                             st.info("💡 **Need a key?** Click the registration link below to get your free activation key instantly.")
 
@@ -1163,26 +1273,7 @@ def render_sam_pro_sidebar():
 
                 # Show what SAM Pro unlocks
                 with st.expander("🎯 What SAM Pro Unlocks", expanded=False):
-                    st.markdown("""
-                    **🧠 Advanced AI Capabilities:**
-                    • **TPV Active Reasoning Control** - 48.4% efficiency gains
-                    • **Enhanced SLP Learning** - Advanced pattern recognition
-                    • **MEMOIR Lifelong Learning** - Continuous knowledge updates
-                    • **Dream Canvas** - Interactive memory visualization
-                    • **Cognitive Distillation Engine** - AI introspection & self-improvement
-
-                    **🔧 Premium Tools:**
-                    • **Cognitive Automation Engine** - Automated reasoning
-                    • **Advanced Memory Analytics** - Deep insights
-                    • **Enhanced Web Retrieval** - Premium search capabilities
-                    • **Extended Context Windows** - Larger conversation memory
-
-                    **🛡️ Enterprise Features:**
-                    • **Priority Support** - Faster response times
-                    • **Advanced Security** - Additional encryption layers
-                    • **Custom Integrations** - API access and webhooks
-                    • **Usage Analytics** - Detailed performance metrics
-                    """)
+                    st.markdown(_SAM_PRO_UNLOCKS_MARKDOWN)
 
         except ImportError:
             st.warning("⚠️ SAM Pro activation system not available")
@@ -1234,7 +1325,8 @@ def render_sam_pro_sidebar():
         status_items = []
 
         # Security status
-        if hasattr(st.session_state, 'security_manager') and st.session_state.security_manager.is_unlocked():
+        security_manager = st.session_state.get('security_manager')
+        if security_manager is not None and security_manager.is_unlocked():
             status_items.append("🔐 Security: ✅ Active")
         else:
             status_items.append("🔐 Security: ❌ Locked")
@@ -1256,18 +1348,17 @@ def render_sam_pro_sidebar():
         else:
             status_items.append("📚 MEMOIR: ❌ Inactive")
 
-        # TPV status (enhanced detection with initialization check)
-        tpv_active = False
+        # Last TPV response (walked once; shared by the TPV and dissonance checks)
+        tpv_session_data = st.session_state.get('tpv_session_data')
+        last_response = tpv_session_data.get('last_response') if tpv_session_data else None
 
-        # Check if TPV is initialized and ready
-        if st.session_state.get('tpv_initialized'):
-            tpv_active = True
-        # Check if TPV was used in last response
-        elif st.session_state.get('tpv_session_data', {}).get('last_response', {}).get('tpv_enabled'):
-            tpv_active = True
-        # Check general TPV active flag
-        elif st.session_state.get('tpv_active'):
-            tpv_active = True
+        # TPV status: initialized and ready, used in the last response, or flagged active
+        session = st.session_state
+        tpv_active = bool(
+            session.get('tpv_initialized') or
+            (last_response and last_response.get('tpv_enabled')) or
+            session.get('tpv_active')
+        )
 
         if tpv_active:
             status_items.append("🧠 TPV: ✅ Active")
@@ -1280,31 +1371,18 @@ def render_sam_pro_sidebar():
         # Check if dissonance monitoring is active
         try:
             # Method 1: Check if TPV integration has dissonance monitoring enabled
-            if st.session_state.get('sam_tpv_integration'):
-                tpv_integration = st.session_state.sam_tpv_integration
-                if hasattr(tpv_integration, 'tpv_monitor') and tpv_integration.tpv_monitor:
-                    if hasattr(tpv_integration.tpv_monitor, 'enable_dissonance_monitoring'):
-                        if tpv_integration.tpv_monitor.enable_dissonance_monitoring:
-                            dissonance_active = True
-
-            # Method 2: Check for dissonance data in recent TPV responses
-            if not dissonance_active:
-                tpv_session_data = st.session_state.get('tpv_session_data', {})
-                last_response = tpv_session_data.get('last_response', {})
-
-                # Check for dissonance data in the last response
+            dissonance_active = _tpv_dissonance_monitoring_enabled(st.session_state.get('sam_tpv_integration'))
+
+            # Method 2: Check for dissonance data in the last TPV response
+            if not dissonance_active and last_response:
                 if (last_response.get('dissonance_analysis') or
                     last_response.get('final_dissonance_score') is not None):
                     dissonance_active = True
 
             # Method 3: If TPV is active and initialized, assume dissonance is available
             if not dissonance_active and tpv_active:
-                try:
-                    # Check if dissonance monitor can be imported and initialized
-                    from sam.cognition.dissonance_monitor import DissonanceMonitor
-                    dissonance_active = True  # If import succeeds, dissonance is available
-                except ImportError:
-                    dissonance_active = False
+                # Dissonance is available if the monitor module can be imported
+                dissonance_active = _dissonance_monitor_available()
 
         except Exception:
             dissonance_active = False
@@ -1324,8 +1402,8 @@ def render_sam_pro_sidebar():
         else:
             status_items.append("🧠 Cognitive Distillation: ❌ Inactive")
 
-        for item in status_items:
-            st.caption(item)
+        # One caption element for the whole list (caption text is markdown)
+        st.caption("\n\n".join(status_items))
 
         # Separator
         st.markdown("---")
@@ -1341,6 +1419,25 @@ def render_sam_pro_sidebar():
                 st.error(f"❌ Failed to lock SAM: {e}")
         st.caption("Lock SAM to protect your data and conversations")
 
+_get_dissonance_monitoring_flag = operator.attrgetter('tpv_monitor.enable_dissonance_monitoring')
+
+def _tpv_dissonance_monitoring_enabled(tpv_integration) -> bool:
+    """Whether a TPV integration's monitor has dissonance monitoring switched on."""
+    try:
+        return bool(_get_dissonance_monitoring_flag(tpv_integration))
+    except AttributeError:
+        # No integration, no monitor, or a monitor without the flag
+        return False
+
+@st.cache_resource(show_spinner=False)
+def _dissonance_monitor_available() -> bool:
+    """Whether the dissonance monitor module can be imported (probed once per process)."""
+    try:
+        from sam.cognition.dissonance_monitor import DissonanceMonitor
+        return True
+    except ImportError:
+        return False
+
 def render_tpv_status():
     """Render enhanced TPV status with Phase 5B dissonance monitoring."""
     try:
@@ -1364,6 +1461,15 @@ def render_tpv_status():
     except Exception as e:
         logger.debug(f"TPV status display error: {e}")
 
+# Indicator shown next to each TPV control decision
+_TPV_DECISION_COLORS = {
+    'COMPLETE': '🟢',
+    'PLATEAU': '🟡',
+    'HALT': '🔴',
+    'DISSONANCE': '🧠',  # NEW: Dissonance stop
+    'CONTINUE': '⚪'
+}
+
 def _render_tpv_status_enhanced_fallback():
     """Enhanced fallback TPV status display with dissonance support."""
     try:
@@ -1371,6 +1477,13 @@ def _render_tpv_status_enhanced_fallback():
         tpv_data = st.session_state.get('tpv_session_data', {}).get('last_response')
 
         if tpv_data and tpv_data.get('tpv_enabled'):
+            # Read each field once; the panels below reuse these locals
+            get = tpv_data.get
+            control_decision = get('control_decision', 'CONTINUE')
+            dissonance_analysis = get('dissonance_analysis')
+            perf_metrics = get('performance_metrics', {})
+            control_stats = get('control_statistics', {})
+
             with st.expander("🧠 Cognitive Process Analysis (Phase 5B: Dissonance-Aware)", expanded=False):
                 # Main metrics row
                 col1, col2, col3, col4 = st.columns(4)
@@ -1378,20 +1491,20 @@ def _render_tpv_status_enhanced_fallback():
                 with col1:
                     st.metric(
                         "Reasoning Score",
-                        f"{tpv_data.get('final_score', 0.0):.3f}",
+                        f"{get('final_score', 0.0):.3f}",
                         help="Final reasoning quality score (0.0 - 1.0)"
                     )
 
                 with col2:
                     st.metric(
                         "TPV Steps",
-                        tpv_data.get('tpv_steps', 0),
+                        get('tpv_steps', 0),
                         help="Number of reasoning steps monitored"
                     )
 
                 with col3:
                     # NEW: Dissonance score display
-                    dissonance_score = tpv_data.get('final_dissonance_score')
+                    dissonance_score = get('final_dissonance_score')
                     if dissonance_score is not None:
                         st.metric(
                             "Final Dissonance",
@@ -1403,14 +1516,7 @@ def _render_tpv_status_enhanced_fallback():
 
                 with col4:
                     # Enhanced control decision with dissonance awareness
-                    control_decision = tpv_data.get('control_decision', 'CONTINUE')
-                    decision_color = {
-                        'COMPLETE': '🟢',
-                        'PLATEAU': '🟡',
-                        'HALT': '🔴',
-                        'DISSONANCE': '🧠',  # NEW: Dissonance stop
-                        'CONTINUE': '⚪'
-                    }.get(control_decision, '⚪')
+                    decision_color = _TPV_DECISION_COLORS.get(control_decision, '⚪')
 
                     st.metric(
                         "Control Decision",
@@ -1419,9 +1525,9 @@ def _render_tpv_status_enhanced_fallback():
                     )
 
                 # Enhanced Control Details with Dissonance Awareness
-                if tpv_data.get('control_decision') != 'CONTINUE':
+                if control_decision != 'CONTINUE':
                     st.subheader("🎛️ Enhanced Control Details")
-                    control_reason = tpv_data.get('control_reason', 'No reason provided')
+                    control_reason = get('control_reason', 'No reason provided')
 
                     if control_decision == 'COMPLETE':
                         st.success(f"✅ **Reasoning Completed**: {control_reason}")
@@ -1433,9 +1539,9 @@ def _render_tpv_status_enhanced_fallback():
                         st.warning(f"🧠 **High Cognitive Dissonance**: {control_reason}")
 
                 # NEW: Dissonance Analysis Section
-                if tpv_data.get('dissonance_analysis'):
+                if dissonance_analysis:
                     st.subheader("🧠 Cognitive Dissonance Analysis")
-                    analysis = tpv_data['dissonance_analysis']
+                    analysis = dissonance_analysis
 
                     col1, col2, col3 = st.columns(3)
                     with col1:
@@ -1447,28 +1553,30 @@ def _render_tpv_status_enhanced_fallback():
                         st.metric("High Dissonance Steps", high_steps)
 
                 # Enhanced Performance metrics with dissonance monitoring
-                perf_metrics = tpv_data.get('performance_metrics', {})
                 if perf_metrics:
+                    total_time = perf_metrics.get('total_time', 0.0)
+                    tpv_overhead = perf_metrics.get('tpv_overhead', 0.0)
+                    dissonance_time = perf_metrics.get('dissonance_processing_time', 0.0)
+
                     st.subheader("📊 Enhanced Performance Metrics")
                     col1, col2, col3, col4 = st.columns(4)
 
                     with col1:
                         st.metric(
                             "Total Time",
-                            f"{perf_metrics.get('total_time', 0.0):.3f}s",
+                            f"{total_time:.3f}s",
                             help="Total response generation time"
                         )
 
                     with col2:
                         st.metric(
                             "TPV Overhead",
-                            f"{perf_metrics.get('tpv_overhead', 0.0):.3f}s",
+                            f"{tpv_overhead:.3f}s",
                             help="TPV monitoring processing overhead"
                         )
 
                     with col3:
                         # NEW: Dissonance processing time
-                        dissonance_time = perf_metrics.get('dissonance_processing_time', 0.0)
                         st.metric(
                             "Dissonance Analysis",
                             f"{dissonance_time:.3f}s",
@@ -1476,9 +1584,9 @@ def _render_tpv_status_enhanced_fallback():
                         )
 
                     with col4:
-                        total_overhead = perf_metrics.get('tpv_overhead', 0.0) + dissonance_time
-                        efficiency = ((perf_metrics.get('total_time', 1) - total_overhead) /
-                                    perf_metrics.get('total_time', 1) * 100)
+                        total_overhead = tpv_overhead + dissonance_time
+                        efficiency_base = perf_metrics.get('total_time', 1)
+                        efficiency = (efficiency_base - total_overhead) / efficiency_base * 100
                         st.metric(
                             "Efficiency",
                             f"{efficiency:.1f}%",
@@ -1486,7 +1594,6 @@ def _render_tpv_status_enhanced_fallback():
                         )
 
                 # Control Statistics
-                control_stats = tpv_data.get('control_statistics', {})
                 if control_stats:
                     st.subheader("🎯 Control Statistics")
                     col1, col2 = st.columns(2)
@@ -1507,7 +1614,6 @@ def _render_tpv_status_enhanced_fallback():
                         )
 
                 # Enhanced Status indicator for Phase 5B
-                control_decision = tpv_data.get('control_decision', 'CONTINUE')
                 if control_decision == 'CONTINUE':
                     st.info("🧠 **Phase 5B Active**: Real-time cognitive dissonance monitoring with meta-reasoning awareness.")
                 elif control_decision == 'DISSONANCE':
@@ -1551,8 +1657,10 @@ def render_chat_document_upload():
 
         # Process uploaded files
         if uploaded_files:
+            # Names of files already processed this session
+            processed_files = st.session_state.setdefault('_processed_chat_uploads', set())
             for uploaded_file in uploaded_files:
-                if f"processed_{uploaded_file.name}" not in st.session_state:
+                if uploaded_file.name not in processed_files:
                     with st.spinner(f"🔐 Processing {uploaded_file.name} securely..."):
                         try:
                             # Process the document using existing secure processing
@@ -1560,7 +1668,7 @@ def render_chat_document_upload():
 
                             if result.get('success', False):
                                 # Mark as processed
-                                st.session_state[f"processed_{uploaded_file.name}"] = True
+                                processed_files.add(uploaded_file.name)
 
                                 # Add success message to chat history
                                 success_message = f"📄 **Document Uploaded**: {uploaded_file.name}\n\n✅ Successfully processed and added to my knowledge. What would you like to know about this document?"
@@ -1593,6 +1701,7 @@ def render_chat_document_upload():
 def generate_document_suggestions(filename: str, file_type: str) -> str:
     """Generate helpful suggestions for document interaction based on file type."""
     suggestions = []
+    lower_name = filename.lower()
 
     # Base suggestions for all documents
     base_suggestions = [
@@ -1602,19 +1711,19 @@ def generate_document_suggestions(filename: str, file_type: str) -> str:
     ]
 
     # Type-specific suggestions
-    if file_type == "application/pdf" or filename.lower().endswith('.pdf'):
+    if file_type == "application/pdf" or lower_name.endswith('.pdf'):
         suggestions.extend([
             f"What are the main sections or chapters in {filename}?",
             f"Are there any charts, graphs, or data visualizations in {filename}?",
             f"What conclusions or recommendations does {filename} make?"
         ])
-    elif file_type == "text/plain" or filename.lower().endswith(('.txt', '.md')):
+    elif file_type == "text/plain" or lower_name.endswith(('.txt', '.md')):
         suggestions.extend([
             f"What is the writing style or format of {filename}?",
             f"Are there any action items or next steps mentioned in {filename}?",
             f"What questions does {filename} raise or answer?"
         ])
-    elif filename.lower().endswith('.docx'):
+    elif lower_name.endswith('.docx'):
         suggestions.extend([
             f"What is the document structure of {filename}?",
             f"Are there any tables or lists in {filename}?",
@@ -1624,14 +1733,13 @@ def generate_document_suggestions(filename: str, file_type: str) -> str:
     # Combine base and specific suggestions
     all_suggestions = base_suggestions + suggestions
 
-    # Format as a helpful response
-    suggestion_text = "Here are some questions you might want to ask about this document:\n\n"
-    for i, suggestion in enumerate(all_suggestions[:6], 1):  # Limit to 6 suggestions
-        suggestion_text += f"{i}. {suggestion}\n"
-
-    suggestion_text += f"\nFeel free to ask any other questions about {filename} - I've processed its content and can help you understand, analyze, or extract information from it!"
-
-    return suggestion_text
+    # Format as a helpful response (limited to 6 suggestions)
+    numbered = "".join(f"{i}. {suggestion}\n" for i, suggestion in enumerate(all_suggestions[:6], 1))
+    return (
+        "Here are some questions you might want to ask about this document:\n\n"
+        f"{numbered}"
+        f"\nFeel free to ask any other questions about {filename} - I've processed its content and can help you understand, analyze, or extract information from it!"
+    )
 
 def generate_secure_chat_response(prompt: str) -> str:
     """Generate a secure chat response for document analysis and general queries."""
@@ -1642,6 +1750,138 @@ def generate_secure_chat_response(prompt: str) -> str:
         logger.error(f"Error generating secure chat response: {e}")
         return f"I apologize, but I encountered an error while processing your request. Please try again or rephrase your question."
 
+@st.cache_resource(show_spinner=False)
+def _get_relevance_engine():
+    """Process-wide contextual relevance engine used by the conversation history sidebar."""
+    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
+    return get_contextual_relevance_engine()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _conversation_analytics(threads_version: int) -> Dict[str, Any]:
+    """Conversation analytics, memoised per archived-threads version (refreshes after 60s)."""
+    return _get_relevance_engine().get_conversation_analytics()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _conversation_ai_insights(threads_version: int) -> Optional[Dict[str, Any]]:
+    """AI insights over the archived threads (None if there are none), memoised like _conversation_analytics."""
+    relevance_engine = _get_relevance_engine()
+    archived_threads = relevance_engine.get_archived_threads()
+    if not archived_threads:
+        return None
+    return relevance_engine.generate_ai_insights(archived_threads)
+
+@st.cache_resource(show_spinner=False)
+def _threads_version_state() -> Dict[str, Any]:
+    """Process-wide archived-threads version; the archive is shared by all sessions."""
+    return {'version': 0, 'lock': threading.Lock()}
+
+def _current_threads_version() -> int:
+    """Version key for the memoised analytics and insights."""
+    return _threads_version_state()['version']
+
+def _bump_threads_version():
+    """Invalidate the memoised analytics and insights (for every session) after archived threads change."""
+    state = _threads_version_state()
+    with state['lock']:
+        state['version'] += 1
+
+@st.fragment
+def _render_conversation_analytics_panel():
+    """Conversation analytics panel (a fragment, so its own reruns skip the rest of the page)."""
+    try:
+        if st.button("🔄 Refresh", key="refresh_conversation_analytics"):
+            _conversation_analytics.clear()
+        analytics = _conversation_analytics(_current_threads_version())
+
+        if 'error' not in analytics:
+            # Basic stats
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                st.metric("Total Conversations", analytics['total_conversations'])
+
+            with col2:
+                st.metric("Total Messages", analytics['total_messages'])
+
+            with col3:
+                st.metric("Avg Length", f"{analytics['average_conversation_length']} msgs")
+
+            # Most common topics
+            if analytics['most_common_topics']:
+                st.markdown("**🏷️ Most Common Topics:**")
+                for topic, count in analytics['most_common_topics'][:5]:
+                    st.markdown(f"• {topic} ({count} times)")
+
+            # Conversation length distribution
+            if analytics['length_distribution']:
+                st.markdown("**📏 Conversation Lengths:**")
+                for length_type, count in analytics['length_distribution'].items():
+                    st.markdown(f"• {length_type}: {count}")
+
+            # Recent activity
+            if analytics['recent_activity']:
+                st.markdown("**🕒 Recent Activity:**")
+                for activity in analytics['recent_activity'][:3]:
+                    st.markdown(f"• {activity['date']} {activity['time']}: {activity['title']}")
+        else:
+            st.error(f"Analytics error: {analytics['error']}")
+
+    except Exception as e:
+        st.error(f"Analytics failed: {e}")
+
+@st.fragment
+def _render_ai_insights_panel():
+    """AI insights panel (a fragment, so its own reruns skip the rest of the page)."""
+    try:
+        if st.button("🔄 Refresh", key="refresh_ai_insights"):
+            _conversation_ai_insights.clear()
+        ai_insights = _conversation_ai_insights(_current_threads_version())
+
+        if ai_insights is not None:
+            if 'error' not in ai_insights:
+                # Display insights
+                if ai_insights.get('insights'):
+                    st.markdown("**🧠 AI Insights:**")
+                    for insight in ai_insights['insights']:
+                        st.markdown(f"• {insight}")
+
+                # Display recommendations
+                if ai_insights.get('recommendations'):
+                    st.markdown("**💡 Recommendations:**")
+                    for rec in ai_insights['recommendations']:
+                        st.markdown(f"• {rec}")
+
+                # Display emerging topics
+                if ai_insights.get('emerging_topics'):
+                    st.markdown("**📈 Emerging Topics:**")
+                    for topic in ai_insights['emerging_topics']:
+                        st.markdown(f"• {topic['topic']} (↑{topic['emergence_score']}x)")
+
+                # Display health metrics
+                if ai_insights.get('health_metrics'):
+                    st.markdown("**📊 Conversation Health:**")
+                    health = ai_insights['health_metrics']
+
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        diversity = health.get('topic_diversity', 0)
+                        st.metric("Topic Diversity", f"{diversity:.2f}")
+
+                    with col2:
+                        engagement = health.get('engagement_level', 0)
+                        st.metric("Engagement", f"{engagement:.2f}")
+
+                    with col3:
+                        overall = health.get('overall_health', 0)
+                        st.metric("Overall Health", f"{overall:.2f}")
+            else:
+                st.error(f"AI insights error: {ai_insights['error']}")
+        else:
+            st.info("No conversation history available for AI analysis.")
+
+    except Exception as e:
+        st.error(f"AI insights failed: {e}")
+
 def render_conversation_history_sidebar():
     """Render the conversation history sidebar (Task 31 Phase 1)."""
     try:
@@ -1651,7 +1891,6 @@ def render_conversation_history_sidebar():
             # New Chat button
             if st.button("➕ New Chat", use_container_width=True, type="primary", key="new_chat_sidebar"):
                 try:
-                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
                     from sam.session.state_manager import get_session_manager
 
                     # Get current conversation buffer
@@ -1661,7 +1900,7 @@ def render_conversation_history_sidebar():
 
                     if conversation_buffer:
                         # Archive current conversation
-                        relevance_engine = get_contextual_relevance_engine()
+                        relevance_engine = _get_relevance_engine()
                         archived_thread = relevance_engine.archive_conversation_thread(
                             conversation_buffer,
                             force_title="Manual New Chat"
@@ -1675,6 +1914,7 @@ def render_conversation_history_sidebar():
                             st.session_state['archived_threads'] = []
 
                         st.session_state['archived_threads'].insert(0, archived_thread.to_dict())
+                        _bump_threads_version()
 
                         # Clear chat history and conversation context
                         st.session_state.chat_history = []
@@ -1740,9 +1980,7 @@ def render_conversation_history_sidebar():
 
                 if search_query and st.button("🔍 Search", key="search_button"):
                     try:
-                        from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
-                        relevance_engine = get_contextual_relevance_engine()
+                        relevance_engine = _get_relevance_engine()
                         search_results = relevance_engine.search_within_threads(search_query, limit=10)
 
                         if search_results:
@@ -1762,107 +2000,15 @@ def render_conversation_history_sidebar():
 
             # Phase 2: Conversation Analytics
             with st.expander("📊 Conversation Analytics", expanded=False):
-                try:
-                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
-                    relevance_engine = get_contextual_relevance_engine()
-                    analytics = relevance_engine.get_conversation_analytics()
-
-                    if 'error' not in analytics:
-                        # Basic stats
-                        col1, col2, col3 = st.columns(3)
-
-                        with col1:
-                            st.metric("Total Conversations", analytics['total_conversations'])
-
-                        with col2:
-                            st.metric("Total Messages", analytics['total_messages'])
-
-                        with col3:
-                            st.metric("Avg Length", f"{analytics['average_conversation_length']} msgs")
-
-                        # Most common topics
-                        if analytics['most_common_topics']:
-                            st.markdown("**🏷️ Most Common Topics:**")
-                            for topic, count in analytics['most_common_topics'][:5]:
-                                st.markdown(f"• {topic} ({count} times)")
-
-                        # Conversation length distribution
-                        if analytics['length_distribution']:
-                            st.markdown("**📏 Conversation Lengths:**")
-                            for length_type, count in analytics['length_distribution'].items():
-                                st.markdown(f"• {length_type}: {count}")
-
-                        # Recent activity
-                        if analytics['recent_activity']:
-                            st.markdown("**🕒 Recent Activity:**")
-                            for activity in analytics['recent_activity'][:3]:
-                                st.markdown(f"• {activity['date']} {activity['time']}: {activity['title']}")
-                    else:
-                        st.error(f"Analytics error: {analytics['error']}")
-
-                except Exception as e:
-                    st.error(f"Analytics failed: {e}")
+                _render_conversation_analytics_panel()
 
             # Phase 3: AI-Powered Insights
             with st.expander("🤖 AI Insights & Recommendations", expanded=False):
-                try:
-                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
-                    relevance_engine = get_contextual_relevance_engine()
-                    archived_threads = relevance_engine.get_archived_threads()
-
-                    if archived_threads:
-                        ai_insights = relevance_engine.generate_ai_insights(archived_threads)
-
-                        if 'error' not in ai_insights:
-                            # Display insights
-                            if ai_insights.get('insights'):
-                                st.markdown("**🧠 AI Insights:**")
-                                for insight in ai_insights['insights']:
-                                    st.markdown(f"• {insight}")
-
-                            # Display recommendations
-                            if ai_insights.get('recommendations'):
-                                st.markdown("**💡 Recommendations:**")
-                                for rec in ai_insights['recommendations']:
-                                    st.markdown(f"• {rec}")
-
-                            # Display emerging topics
-                            if ai_insights.get('emerging_topics'):
-                                st.markdown("**📈 Emerging Topics:**")
-                                for topic in ai_insights['emerging_topics']:
-                                    st.markdown(f"• {topic['topic']} (↑{topic['emergence_score']}x)")
-
-                            # Display health metrics
-                            if ai_insights.get('health_metrics'):
-                                st.markdown("**📊 Conversation Health:**")
-                                health = ai_insights['health_metrics']
-
-                                col1, col2, col3 = st.columns(3)
-                                with col1:
-                                    diversity = health.get('topic_diversity', 0)
-                                    st.metric("Topic Diversity", f"{diversity:.2f}")
-
-                                with col2:
-                                    engagement = health.get('engagement_level', 0)
-                                    st.metric("Engagement", f"{engagement:.2f}")
-
-                                with col3:
-                                    overall = health.get('overall_health', 0)
-                                    st.metric("Overall Health", f"{overall:.2f}")
-                        else:
-                            st.error(f"AI insights error: {ai_insights['error']}")
-                    else:
-                        st.info("No conversation history available for AI analysis.")
-
-                except Exception as e:
-                    st.error(f"AI insights failed: {e}")
+                _render_ai_insights_panel()
 
             # Phase 3: Cross-Conversation Context
             with st.expander("🌉 Related Conversations", expanded=False):
                 try:
-                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
                     from sam.session.state_manager import get_session_manager
 
                     # Get current conversation context
@@ -1876,7 +2022,7 @@ def render_conversation_history_sidebar():
                         if user_messages:
                             last_query = user_messages[-1].get('content', '')
 
-                            relevance_engine = get_contextual_relevance_engine()
+                            relevance_engine = _get_relevance_engine()
                             related_conversations = relevance_engine.find_related_conversations(
                                 last_query, current_buffer, limit=3
                             )
@@ -1894,6 +2040,7 @@ def render_conversation_history_sidebar():
                                         if st.button(f"🔄 Resume", key=f"related_resume_{related['thread_id']}"):
                                             try:
                                                 if relevance_engine.resume_conversation_thread(related['thread_id']):
+                                                    _bump_threads_version()
                                                     st.success(f"✅ Resumed: '{related['title']}'")
                                                     st.rerun()
                                                 else:
@@ -1913,9 +2060,7 @@ def render_conversation_history_sidebar():
             # Phase 3: Export & Optimization
             with st.expander("📤 Export & Optimization", expanded=False):
                 try:
-                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
-                    relevance_engine = get_contextual_relevance_engine()
+                    relevance_engine = _get_relevance_engine()
 
                     # Export section
                     st.markdown("**📤 Export Conversations:**")
@@ -1976,6 +2121,7 @@ def render_conversation_history_sidebar():
                     if st.button("🚀 Optimize Storage", key="optimize_storage"):
                         try:
                             optimization_result = relevance_engine.optimize_conversation_storage()
+                            _bump_threads_version()
 
                             if optimization_result.get('success', True):
                                 st.success("✅ Storage optimization completed!")
@@ -2059,12 +2205,11 @@ def render_conversation_history_sidebar():
                         with col1:
                             if st.button(f"🔄 Resume", key=f"resume_{i}"):
                                 try:
-                                    from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
-                                    relevance_engine = get_contextual_relevance_engine()
+                                    relevance_engine = _get_relevance_engine()
                                     thread_id = thread_data.get('thread_id')
 
                                     if relevance_engine.resume_conversation_thread(thread_id):
+                                        _bump_threads_version()
                                         st.success(f"✅ Resumed: '{thread_title}'")
                                         st.rerun()
                                     else:
@@ -2091,13 +2236,12 @@ def render_conversation_history_sidebar():
                                 if st.button("💾 Save Tags", key=f"save_tags_{i}"):
                                     if tag_input.strip():
                                         try:
-                                            from sam.conversation.contextual_relevance import get_contextual_relevance_engine
-
                                             tags = [tag.strip() for tag in tag_input.split(',') if tag.strip()]
-                                            relevance_engine = get_contextual_relevance_engine()
+                                            relevance_engine = _get_relevance_engine()
                                             thread_id = thread_data.get('thread_id')
 
                                             if relevance_engine.add_tags_to_thread(thread_id, tags):
+                                                _bump_threads_version()
                                                 st.success(f"✅ Added tags: {', '.join(tags)}")
                                                 st.session_state[f'show_tag_input_{i}'] = False
                                                 st.rerun()
@@ -3994,11 +4138,14 @@ def get_secure_system_status() -> str:
 **🧠 Advanced Reasoning Systems:**"""
 
         # Add TPV status
-        tpv_active = False
-        if (st.session_state.get('tpv_initialized') or
-            st.session_state.get('tpv_session_data', {}).get('last_response', {}).get('tpv_enabled') or
-            st.session_state.get('tpv_active')):
-            tpv_active = True
+        session = st.session_state
+        tpv_session_data = session.get('tpv_session_data')
+        last_response = tpv_session_data.get('last_response') if tpv_session_data else None
+        tpv_active = bool(
+            session.get('tpv_initialized') or
+            (last_response and last_response.get('tpv_enabled')) or
+            session.get('tpv_active')
+        )
 
         tpv_status = "✅ Active" if tpv_active else "❌ Inactive"
         status_report += f"\n• TPV Active Control: {tpv_status}"
@@ -4007,20 +4154,11 @@ def get_secure_system_status() -> str:
         dissonance_active = False
         try:
             # Check if TPV integration has dissonance monitoring enabled
-            if st.session_state.get('sam_tpv_integration'):
-                tpv_integration = st.session_state.sam_tpv_integration
-                if hasattr(tpv_integration, 'tpv_monitor') and tpv_integration.tpv_monitor:
-                    if hasattr(tpv_integration.tpv_monitor, 'enable_dissonance_monitoring'):
-                        if tpv_integration.tpv_monitor.enable_dissonance_monitoring:
-                            dissonance_active = True
+            dissonance_active = _tpv_dissonance_monitoring_enabled(st.session_state.get('sam_tpv_integration'))
 
             # Fallback: If TPV is active, assume dissonance is available
             if not dissonance_active and tpv_active:
-                try:
-                    from sam.cognition.dissonance_monitor import DissonanceMonitor
-                    dissonance_active = True
-                except ImportError:
-                    dissonance_active = False
+                dissonance_active = _dissonance_monitor_available()
         except Exception:
             dissonance_active = False
 
@@ -9334,6 +9472,7 @@ def generate_response_with_conversation_buffer(prompt: str, force_local: bool =
                         st.session_state['archived_threads'] = []
 
                     st.session_state['archived_threads'].insert(0, archived_thread.to_dict())
+                    _bump_threads_version()
 
                     # Set flag for UI notification
                     st.session_state['conversation_archived'] = {
@@ -9915,10 +10054,11 @@ def process_secure_document(uploaded_file) -> dict:
 
             # PHASE 2: Process through multimodal pipeline for knowledge consolidation
             consolidation_result = None
-            if 'multimodal_pipeline' in st.session_state:
+            multimodal_pipeline = _get_multimodal_pipeline()
+            if multimodal_pipeline is not None:
                 try:
                     logger.info(f"🧠 Starting knowledge consolidation for: {uploaded_file.name}")
-                    consolidation_result = st.session_state.multimodal_pipeline.process_document(temp_file_path)
+                    consolidation_result = multimodal_pipeline.process_document(temp_file_path)
 
                     if consolidation_result:
                         logger.info(f"✅ Knowledge consolidation completed: {consolidation_result.get('summary_length', 0)} chars summary")
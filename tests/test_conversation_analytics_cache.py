@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Conversation Analytics Memoisation
+=================================================
+
+Tests that the memoised conversation analytics and AI insights are
+invalidated for every session when any session changes the archive.
+
+Author: SAM Development Team
+Version: 1.0.0
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import secure_streamlit_app as app
+
+
+class _FakeRelevanceEngine:
+    """Relevance engine whose results change every time the archive changes."""
+
+    def __init__(self):
+        self.archived = []
+
+    def archive(self, title):
+        self.archived.append(title)
+
+    def get_conversation_analytics(self):
+        return {'total_conversations': len(self.archived)}
+
+    def get_archived_threads(self):
+        return list(self.archived)
+
+    def generate_ai_insights(self, archived_threads):
+        return {'insights': list(archived_threads)}
+
+
+class TestConversationAnalyticsCache:
+    """Test cases for the process-wide archived-threads version."""
+
+    def setup_method(self):
+        """Route the cached helpers to a fresh fake engine."""
+        self.engine = _FakeRelevanceEngine()
+        self._original_engine = app._get_relevance_engine
+        app._get_relevance_engine = lambda: self.engine
+        app._conversation_analytics.clear()
+        app._conversation_ai_insights.clear()
+
+    def teardown_method(self):
+        app._get_relevance_engine = self._original_engine
+        app._conversation_analytics.clear()
+        app._conversation_ai_insights.clear()
+
+    def _archive_in_session(self, title):
+        """What the chat handler does when a session archives a thread."""
+        self.engine.archive(title)
+        app._bump_threads_version()
+
+    def test_independent_sessions_see_fresh_analytics(self):
+        """Two sessions bumping independently never reuse each other's cache entries."""
+        assert app._conversation_analytics(app._current_threads_version()) == {'total_conversations': 0}
+
+        # Session A archives and renders its panel
+        self._archive_in_session("A")
+        assert app._conversation_analytics(app._current_threads_version()) == {'total_conversations': 1}
+
+        # Session B archives later; it must not be served A's cached result
+        self._archive_in_session("B")
+        assert app._conversation_analytics(app._current_threads_version()) == {'total_conversations': 2}
+
+    def test_independent_sessions_see_fresh_insights(self):
+        """AI insights follow the same process-wide version."""
+        assert app._conversation_ai_insights(app._current_threads_version()) is None
+
+        self._archive_in_session("A")
+        assert app._conversation_ai_insights(app._current_threads_version()) == {'insights': ["A"]}
+
+        self._archive_in_session("B")
+        assert app._conversation_ai_insights(app._current_threads_version()) == {'insights': ["A", "B"]}
+
+    def test_versions_never_repeat(self):
+        """Every bump yields a new key, whichever session performs it."""
+        seen = {app._current_threads_version()}
+        for _ in range(5):
+            app._bump_threads_version()
+            version = app._current_threads_version()
+            assert version not in seen
+            seen.add(version)
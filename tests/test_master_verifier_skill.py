@@ -150,6 +150,38 @@ class TestMasterVerifierSkill:
         assert key1 != key3  # Different inputs should generate different keys
         assert len(key1) == 32  # MD5 hash length
     
+    def test_cache_key_reused_for_identical_string_objects(self):
+        """Test that repeated string objects reuse the precomputed digest."""
+        question = "What is 2+2?"
+        response = "The answer is 4."
+        reference = "4"
+        
+        key1 = self.skill._lookup_cache_key(question, response, reference)
+        with patch.object(self.skill, '_generate_cache_key') as mock_generate:
+            key2 = self.skill._lookup_cache_key(question, response, reference)
+            mock_generate.assert_not_called()
+        
+        assert key1 == key2
+        assert key1 == self.skill._generate_cache_key(question, response, reference)
+
+    def test_cache_key_memo_evicts_least_recently_used(self):
+        """Test that the string-identity memo stays bounded and keeps accepting new inputs."""
+        with patch('sam.orchestration.skills.master_verifier_skill._STR_ID_CACHE_MAX_ENTRIES', 2):
+            first = ("q1", "r1", "ref1")
+            second = ("q2", "r2", "ref2")
+            third = ("q3", "r3", "ref3")
+
+            self.skill._lookup_cache_key(*first)
+            self.skill._lookup_cache_key(*second)
+            self.skill._lookup_cache_key(*first)  # refresh first, second is now oldest
+            self.skill._lookup_cache_key(*third)
+
+            cached = [entry[:3] for entry in self.skill._str_id_cache.values()]
+            assert len(cached) == 2
+            assert first in cached
+            assert third in cached
+            assert second not in cached
+
     def test_fallback_verification_methods(self):
         """Test different fallback verification methods."""
         response = "Let's solve this problem step by step."
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Prompt Steerer Style Loading
+===========================================
+
+Tests that reasoning style templates are registered under their style_name,
+that invalid templates fall back to the default styles, and that the list of
+available styles stays stable across calls.
+
+Author: SAM Development Team
+Version: 1.0.0
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sam.reasoning.prompt_steerer import PromptSteerer
+
+DEFAULT_STYLES = ['researcher_style', 'step_by_step_reasoning', 'creative_explorer']
+
+
+def _write_template(directory, file_name, style_name, **overrides):
+    template = {
+        "style_name": style_name,
+        "description": f"{style_name} description",
+        "system_instruction": f"Reason like {style_name}.",
+        "reasoning_pattern": "first → second",
+    }
+    template.update(overrides)
+    (directory / file_name).write_text(json.dumps(template))
+
+
+class TestPromptSteererStyles:
+    """Test cases for PromptSteerer template loading."""
+
+    def test_styles_keyed_by_style_name(self, tmp_path):
+        """A template is addressed by its style_name, not its file name."""
+        _write_template(tmp_path, "bar_template.json", "foo")
+
+        steerer = PromptSteerer(assets_dir=str(tmp_path))
+
+        assert steerer.get_available_styles() == ["foo"]
+        assert steerer.apply_style("hi", "foo") != "hi"
+        assert steerer.apply_style("hi", "bar") == "hi"
+        assert steerer.get_style_info("foo")["name"] == "foo"
+
+    def test_invalid_templates_fall_back_to_defaults(self, tmp_path):
+        """When no template is valid the default styles are used from the start."""
+        (tmp_path / "bad_template.json").write_text("{not json")
+        (tmp_path / "partial_template.json").write_text(json.dumps({"style_name": "partial"}))
+
+        steerer = PromptSteerer(assets_dir=str(tmp_path))
+
+        assert steerer.get_available_styles() == DEFAULT_STYLES
+        assert steerer.apply_style("hi", "bad") == "hi"
+        assert steerer.apply_style("hi", "researcher_style") != "hi"
+
+    def test_invalid_template_skipped_alongside_valid_ones(self, tmp_path):
+        """An invalid template is never listed next to the valid styles."""
+        _write_template(tmp_path, "good_template.json", "good")
+        (tmp_path / "bad_template.json").write_text("{not json")
+
+        steerer = PromptSteerer(assets_dir=str(tmp_path))
+
+        assert steerer.get_available_styles() == ["good"]
+
+    def test_available_styles_stable_across_use(self, tmp_path):
+        """Using styles does not change the list of available styles."""
+        _write_template(tmp_path, "a_template.json", "alpha")
+        (tmp_path / "bad_template.json").write_text("{not json")
+
+        steerer = PromptSteerer(assets_dir=str(tmp_path))
+        before = steerer.get_available_styles()
+        steerer.apply_style("hi", "bad")
+        steerer.apply_style("hi", "alpha")
+
+        assert steerer.get_available_styles() == before == ["alpha"]
+
+    def test_concurrent_first_use(self, tmp_path):
+        """Threads racing on first use all see the same loaded styles."""
+        (tmp_path / "bad_template.json").write_text("{not json")
+        steerer = PromptSteerer(assets_dir=str(tmp_path))
+        results = []
+        errors = []
+
+        def use_steerer():
+            try:
+                steerer.apply_style("hi", "bad")
+                results.append(steerer.get_available_styles())
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=use_steerer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert results == [DEFAULT_STYLES] * 8
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test Suite for SAM Pro Registration Storage
+===========================================
+
+Tests that registration writes to the keystore and entitlements documents
+keep the files' permissions intact.
+
+Author: SAM Development Team
+Version: 1.0.0
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sam_pro_registration
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fchmod'), reason="POSIX permissions only")
+class TestSaveJsonDocumentPermissions:
+    """Test cases for _save_json_document file modes."""
+
+    def test_keeps_owner_only_mode(self, tmp_path):
+        """A 0600 keystore must still be 0600 after a registration write."""
+        keystore = tmp_path / "keystore.json"
+        keystore.write_text("{}")
+        os.chmod(keystore, 0o600)
+
+        sam_pro_registration._save_json_document(keystore, {"sam_pro_keys": {}})
+
+        assert _mode(keystore) == 0o600
+        assert sam_pro_registration._load_json_document(keystore) == {"sam_pro_keys": {}}
+
+    def test_keeps_existing_mode(self, tmp_path):
+        """Files with wider permissions keep them rather than being tightened."""
+        entitlements = tmp_path / "entitlements.json"
+        entitlements.write_text("{}")
+        os.chmod(entitlements, 0o644)
+
+        sam_pro_registration._save_json_document(entitlements, {"sam_pro_keys": {}})
+
+        assert _mode(entitlements) == 0o644
+
+    def test_new_file_is_owner_only(self, tmp_path):
+        """A document created by the save is not readable by other users."""
+        keystore = tmp_path / "keystore.json"
+
+        sam_pro_registration._save_json_document(keystore, {})
+
+        assert _mode(keystore) == 0o600
+        assert not (tmp_path / "keystore.tmp").exists()